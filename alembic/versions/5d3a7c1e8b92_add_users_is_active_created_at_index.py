@@ -0,0 +1,41 @@
+"""add users (is_active, created_at, id) index for filtered lists
+
+Revision ID: 5d3a7c1e8b92
+Revises: e2b8f04a9c63
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5d3a7c1e8b92"
+down_revision: str | Sequence[str] | None = "e2b8f04a9c63"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_is_active_created_at_id",
+            "users",
+            ["is_active", "created_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_users_is_active_created_at_id",
+            table_name="users",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,41 @@
+"""add users (created_at, id) index for keyset pagination
+
+Revision ID: 8a4e6d2c5b31
+Revises: 3f1c2a9b7d10
+Create Date: 2026-10-18 09:30:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8a4e6d2c5b31"
+down_revision: str | Sequence[str] | None = "3f1c2a9b7d10"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_created_at_id",
+            "users",
+            ["created_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_users_created_at_id",
+            table_name="users",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,70 @@
+"""add users (updated_at, id) and (is_active, updated_at, id) indexes for sorts
+
+Revision ID: 9b2f6e1d4a07
+Revises: 5d3a7c1e8b92
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9b2f6e1d4a07"
+down_revision: str | Sequence[str] | None = "5d3a7c1e8b92"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_updated_at_id",
+            "users",
+            ["updated_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_users_is_active_updated_at_id",
+            "users",
+            ["is_active", "updated_at", "id"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # Covered by ix_users_updated_at_id
+        op.drop_index(
+            "ix_users_updated_at",
+            table_name="users",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_updated_at",
+            "users",
+            ["updated_at"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_users_is_active_updated_at_id",
+            table_name="users",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_users_updated_at_id",
+            table_name="users",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
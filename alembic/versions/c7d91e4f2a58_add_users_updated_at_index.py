@@ -0,0 +1,41 @@
+"""add users updated_at index for list ETags
+
+Revision ID: c7d91e4f2a58
+Revises: 8a4e6d2c5b31
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c7d91e4f2a58"
+down_revision: str | Sequence[str] | None = "8a4e6d2c5b31"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_updated_at",
+            "users",
+            ["updated_at"],
+            unique=False,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_users_updated_at",
+            table_name="users",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
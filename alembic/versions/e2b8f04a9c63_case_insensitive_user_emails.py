@@ -0,0 +1,98 @@
+"""case-insensitive user emails with search indexes
+
+Revision ID: e2b8f04a9c63
+Revises: c7d91e4f2a58
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import context, op
+
+# revision identifiers, used by Alembic.
+revision: str = "e2b8f04a9c63"
+down_revision: str | Sequence[str] | None = "c7d91e4f2a58"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Offline (--sql) there is no data to check, the unique index still
+    # refuses to build over emails differing only by case
+    duplicates = []
+    if not context.is_offline_mode():
+        duplicates = (
+            op.get_bind()
+            .execute(
+                sa.text(
+                    "SELECT lower(email) FROM users "
+                    "GROUP BY lower(email) HAVING count(*) > 1 LIMIT 10"
+                )
+            )
+            .scalars()
+            .all()
+        )
+    if duplicates:
+        raise RuntimeError(
+            "Users whose emails differ only by case must be merged first: "
+            + ", ".join(duplicates)
+        )
+
+    op.execute("UPDATE users SET email = lower(email) WHERE email <> lower(email)")
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_email_lower",
+            "users",
+            [sa.text("lower(email) text_pattern_ops")],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_users_email_trgm",
+            "users",
+            [sa.text("lower(email) gin_trgm_ops")],
+            unique=False,
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        # Superseded by ix_users_email_lower
+        op.drop_index(
+            "ix_users_email",
+            table_name="users",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # pg_trgm is left installed, other objects may depend on it
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_email",
+            "users",
+            ["email"],
+            unique=True,
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_users_email_trgm",
+            table_name="users",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_users_email_lower",
+            table_name="users",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
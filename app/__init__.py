@@ -0,0 +1,4 @@
+import time
+
+# Reference point of the startup timings, the first import of the package
+IMPORT_STARTED = time.perf_counter()
@@ -0,0 +1,72 @@
+import hashlib
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any
+
+from fastapi import Request, Response
+
+
+def make_etag(*parts: Any) -> str:
+    """Weak ETag identifying a representation built from ``parts``"""
+    digest = hashlib.blake2b(
+        "\x1f".join(str(part) for part in parts).encode(), digest_size=12
+    ).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _http_date(value: datetime) -> str:
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return format_datetime(value.astimezone(UTC), usegmt=True)
+
+
+def _opaque(etag: str) -> str:
+    return etag.strip().removeprefix("W/")
+
+
+def is_not_modified(
+    request: Request, etag: str, last_modified: datetime | None = None
+) -> bool:
+    """Whether the client's cached copy is current (RFC 9110 section 13.1).
+
+    ``If-None-Match`` is compared weakly; ``If-Modified-Since`` is only
+    considered when the request has no ``If-None-Match``.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        current = _opaque(etag)
+        return any(_opaque(tag) == current for tag in if_none_match.split(","))
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=UTC)
+    if last_modified.tzinfo is None:
+        last_modified = last_modified.replace(tzinfo=UTC)
+    # HTTP dates have a one second resolution
+    return last_modified.replace(microsecond=0) <= since
+
+
+def set_validators(
+    response: Response, etag: str, last_modified: datetime | None = None
+) -> Response:
+    """Add ``ETag`` and ``Last-Modified`` to ``response``"""
+    response.headers["ETag"] = etag
+    if last_modified is not None:
+        response.headers["Last-Modified"] = _http_date(last_modified)
+    # Caches may store the response but must revalidate it before reuse
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+def not_modified(etag: str, last_modified: datetime | None = None) -> Response:
+    """Empty ``304 Not Modified`` carrying the current validators"""
+    return set_validators(Response(status_code=304), etag, last_modified)
@@ -0,0 +1,49 @@
+from collections.abc import Iterable
+from functools import lru_cache
+from typing import Any, TypeVar
+
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+SchemaType = TypeVar("SchemaType", bound=BaseModel)
+
+
+@lru_cache(maxsize=256)
+def get_type_adapter(schema: Any) -> TypeAdapter:
+    """Compiled validator/serializer for ``schema``, built once per type"""
+    return TypeAdapter(schema)
+
+
+@lru_cache(maxsize=256)
+def _field_names(schema: type[BaseModel]) -> tuple[str, ...]:
+    return tuple(schema.model_fields)
+
+
+def from_row(schema: type[SchemaType], row: Any) -> SchemaType:
+    """Build ``schema`` from a database row without running its validators.
+
+    Rows were validated when they were written, re-running validators such
+    as ``EmailStr`` on the way out dominates the cost of list endpoints.
+    """
+    return schema.model_construct(
+        **{name: getattr(row, name) for name in _field_names(schema)}
+    )
+
+
+def from_rows(schema: type[SchemaType], rows: Iterable[Any]) -> list[SchemaType]:
+    """``from_row`` for every row"""
+    names = _field_names(schema)
+    construct = schema.model_construct
+    return [construct(**{name: getattr(row, name) for name in names}) for row in rows]
+
+
+class SchemaJSONResponse(JSONResponse):
+    """JSON response serialized by pydantic-core straight to bytes.
+
+    Routes that return this with an already built schema skip FastAPI's
+    ``response_model`` validation and ``jsonable_encoder`` pass; the
+    ``response_model`` is still used for the OpenAPI docs.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return get_type_adapter(type(content)).dump_json(content)
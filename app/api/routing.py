@@ -0,0 +1,37 @@
+from collections.abc import Callable, Coroutine
+from typing import Any
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+
+class UnitOfWorkRoute(APIRoute):
+    """Route committing the request's unit of work before responding.
+
+    Dependencies with ``yield`` are torn down after the response is sent,
+    too late to report a failed commit, so the commit happens here once
+    the endpoint succeeded. Any exception rolls the work back.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            try:
+                response = await handler(request)
+            except BaseException:
+                unit_of_work = getattr(request.state, "unit_of_work", None)
+                if unit_of_work is not None:
+                    await unit_of_work.rollback()
+                raise
+
+            unit_of_work = getattr(request.state, "unit_of_work", None)
+            if unit_of_work is not None:
+                if response.status_code < 400:
+                    await unit_of_work.commit()
+                else:
+                    await unit_of_work.rollback()
+
+            return response
+
+        return route_handler
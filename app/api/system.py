@@ -1,11 +1,17 @@
-from typing import Annotated
+import math
 
-from fastapi import APIRouter, Depends
-from sqlalchemy import text
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, HTTPException, Response, status
 
 from app.core.config import get_setting
-from app.core.deps import get_database
+from app.core.exceptions import ServiceUnavailableError
+from app.core.metrics import CONTENT_TYPE, registry
+from app.core.startup import startup_timings
+from app.db.health import database_health
+from app.db.pool import get_pool_status
+from app.db.session import get_engine, get_replica_set
+from app.middleware.admission import admission_controller
+from app.repositories.cache import entity_cache
+from app.repositories.singleflight import repository_flight
 from app.schemas.base import ResponseBase
 
 router = APIRouter(tags=["System"])
@@ -29,47 +35,47 @@ async def root():
 
 
 @router.get("/health", response_model=ResponseBase)
-async def health_check(db: Annotated[AsyncSession, Depends(get_database)]):
-    """Health check endpoint"""
-    db_status = "disconnected"
-    db_error = None
-
-    try:
-        result = await db.execute(text("SELECT 1"))
-        result.fetchone()
-        db_status = "connected"
-    except Exception as e:
-        db_error = str(e)
+async def health_check():
+    """Health check endpoint, from the last background database probe"""
+    connected = database_health.connected
 
     return ResponseBase(
-        success=db_status == "connected",
-        message="healthy"
-        if db_status == "connected"
-        else "unhealthy - database disconnected",
+        success=bool(connected),
+        message="healthy" if connected else "unhealthy - database disconnected",
         data={
-            "status": "healthy" if db_status == "connected" else "unhealthy",
+            "status": "healthy" if connected else "unhealthy",
             "environment": _settings.ENVIRONMENT,
             "version": _settings.VERSION,
             "api_version": _settings.API_V1_STR,
-            "database": db_status,
-            "database_error": db_error if db_error else None,
+            "database": database_health.status,
+            "database_error": database_health.error,
+            "checked_at": database_health.checked_at,
         },
     )
 
 
+@router.get("/health/live", response_model=ResponseBase)
+async def liveness():
+    """Liveness probe, the process is serving requests"""
+    return ResponseBase(data={"status": "alive"})
+
+
+@router.get("/health/ready", response_model=ResponseBase)
+async def readiness():
+    """Readiness probe, the last background database probe succeeded"""
+    if not database_health.ready:
+        raise ServiceUnavailableError(
+            "Database unavailable", retry_after=math.ceil(database_health.interval)
+        )
+    return ResponseBase(data={"status": "ready", "database": database_health.as_dict()})
+
+
 @router.get("/info", response_model=ResponseBase)
-async def app_info(db: Annotated[AsyncSession, Depends(get_database)]):
+async def app_info():
     """Application information endpoint"""
-    db_info = {"status": "disconnected", "version": None}
-
-    try:
-        # Get PostgreSQL version
-        result = await db.execute(text("SELECT version();"))
-        version = result.fetchone()
-        db_info["status"] = "connected"
-        db_info["version"] = version[0].split(",")[0] if version else None
-    except Exception as e:
-        db_info["error"] = str(e)
+    db_info = {"status": database_health.status, "version": database_health.version}
+    if database_health.error:
+        db_info["error"] = database_health.error
 
     return ResponseBase(
         data={
@@ -80,5 +86,36 @@ async def app_info(db: Annotated[AsyncSession, Depends(get_database)]):
             "docs_url": "/docs",
             "redoc_url": "/redoc",
             "database": db_info,
+            "entity_cache": entity_cache.stats() if entity_cache else None,
+            "single_flight": repository_flight.stats() if repository_flight else None,
+            "admission": admission_controller.stats()
+            if _settings.ADMISSION_ENABLED
+            else None,
+            "startup_ms": startup_timings.as_dict(),
         }
     )
+
+
+@router.get("/db/pool", response_model=ResponseBase)
+async def pool_status():
+    """Connection pool occupancy and checkout wait times"""
+    replica_set = get_replica_set()
+    return ResponseBase(
+        data={
+            "primary": get_pool_status(get_engine().pool),
+            "replicas": [
+                {**status, "pool": get_pool_status(replica.engine.pool)}
+                for replica, status in zip(
+                    replica_set.replicas, replica_set.status(), strict=True
+                )
+            ],
+        }
+    )
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Metrics in the Prometheus text exposition format"""
+    if not _settings.METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND)
+    return Response(registry.render(), media_type=CONTENT_TYPE)
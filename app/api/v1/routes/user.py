@@ -1,33 +1,230 @@
-from fastapi import APIRouter, Depends
+import csv
+import io
+import json
+from collections.abc import AsyncIterator
+from contextlib import aclosing
+from datetime import datetime
+from typing import Annotated, Any, Literal
+from uuid import UUID
 
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
+
+from app.api.conditional import (
+    is_not_modified,
+    make_etag,
+    not_modified,
+    set_validators,
+)
+from app.api.responses import SchemaJSONResponse, from_row, from_rows
+from app.api.routing import UnitOfWorkRoute
+from app.core.exceptions import EntityNotFoundError, ValidationError
+from app.repositories.pagination import CountStrategy
 from app.schemas.base import PaginationMeta, PaginationResponse, ResponseBase
-from app.schemas.user import UserCreate, UserInDB
-from app.services.user_service import UserService, get_user_service
+from app.schemas.user import (
+    UserBulkCreateResult,
+    UserBulkUpdate,
+    UserCreate,
+    UserFilter,
+    UserInDB,
+    UserUpdate,
+)
+from app.services.user_service import (
+    UserService,
+    get_bulk_user_service,
+    get_user_service,
+)
 
-router = APIRouter(tags=["Users"])
+router = APIRouter(tags=["Users"], route_class=UnitOfWorkRoute)
 
 _user_service = Depends(get_user_service)
+# Bulk imports commit chunk by chunk, outside the request's unit of work
+_bulk_user_service = Depends(get_bulk_user_service)
+
+_NDJSON_TYPES = ("application/x-ndjson", "application/jsonl", "application/ndjson")
+
+
+async def _iter_ndjson(request: Request) -> AsyncIterator[Any]:
+    """Yield one decoded object per line of a streamed NDJSON body.
+
+    Lines that are not valid JSON are yielded as raw text so they are
+    reported as invalid rows instead of aborting the whole request.
+    """
+    buffer = b""
+    async for chunk in request.stream():
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                yield _decode_line(line)
+
+    if buffer.strip():
+        yield _decode_line(buffer)
+
+
+def _decode_line(line: bytes) -> Any:
+    try:
+        return json.loads(line)
+    except ValueError:
+        return line.decode(errors="replace")
+
+
+async def _iter_json_array(request: Request) -> AsyncIterator[Any]:
+    """Yield the items of a JSON array body"""
+    try:
+        items = await request.json()
+    except ValueError as e:
+        raise ValidationError("Body is not valid JSON", field="body") from e
+
+    if not isinstance(items, list):
+        raise ValidationError("Body must be a JSON array", field="body")
+
+    for item in items:
+        yield item
 
 
 @router.get("/", response_model=PaginationResponse[UserInDB])
 async def get_users(
+    request: Request,
     user_service: UserService = _user_service,
-    skip: int = 0,
-    limit: int = 100,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1),
+    pagination: Literal["offset", "cursor"] = "offset",
+    cursor: str | None = None,
+    count: CountStrategy = CountStrategy.EXACT,
+    search: str | None = Query(
+        None,
+        min_length=1,
+        max_length=254,
+        description="Case-insensitive email search, terms of 3 characters or"
+        " more match anywhere in the email, shorter ones its start",
+    ),
+    is_active: bool | None = None,
+    created_after: datetime | None = None,
+    created_before: datetime | None = None,
+    sort: str | None = Query(
+        None,
+        max_length=64,
+        description="created_at or updated_at, prefixed with - for descending;"
+        " updated_at cannot be combined with created_after or created_before",
+        examples=["-created_at"],
+    ),
 ):
-    """Get all users"""
-    total, users = await user_service.list_users(skip, limit)
+    """Get all users
+
+    Use ``pagination=cursor`` (or pass a ``cursor``) for keyset pagination,
+    which stays fast on deep pages of large tables. In offset mode ``count``
+    selects how the total is obtained.
+
+    ``search`` filters on the email through the ``lower(email)`` indexes;
+    ``is_active``, ``created_after`` and ``created_before`` through the
+    ``created_at`` indexes. A filtered total is counted exactly with
+    ``count=exact|window`` only, ``cached`` and ``estimated`` give the
+    planner's estimate of the filtered query, or no total without one.
+    ``sort`` takes one key; ``updated_at`` combines with ``is_active`` only,
+    as no index ranges on ``created_at`` in that order. Cursor pages are
+    always in ``created_at`` order.
+
+    Pages carry an ETag derived from the latest change and the number of
+    users; a matching ``If-None-Match`` is answered with 304 before the
+    page is loaded. Deleting a user leaves the latest change alone, so
+    lists send no ``Last-Modified`` and ignore ``If-Modified-Since``.
+    """
+    last_modified, user_count = await user_service.users_version()
+    etag = make_etag("users", last_modified, user_count, request.url.query)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
+    filters = {
+        "is_active": is_active,
+        "created_after": created_after,
+        "created_before": created_before,
+    }
+
+    if cursor is not None or pagination == "cursor":
+        if sort not in (None, "created_at"):
+            raise ValidationError(
+                "Cursor pagination is always sorted by created_at", field="sort"
+            )
+        page = await user_service.list_users_by_cursor(cursor, limit, search, filters)
+        meta = PaginationMeta(
+            per_page=limit,
+            total_exact=False,
+            has_next=page.next_cursor is not None,
+            has_prev=page.prev_cursor is not None,
+            next_cursor=page.next_cursor,
+            prev_cursor=page.prev_cursor,
+        )
+    else:
+        page = await user_service.list_users(skip, limit, count, search, filters, sort)
+        total = page.total
+        meta = PaginationMeta(
+            page=(skip // limit) + 1,
+            per_page=limit,
+            total=total,
+            total_exact=page.total_exact,
+            pages=(total + limit - 1) // limit if total is not None else None,
+            has_next=page.has_next,
+            has_prev=skip > 0,
+        )
 
-    meta = PaginationMeta(
-        page=(skip // limit) + 1,
-        per_page=limit,
-        total=total,
-        pages=(total + limit - 1) // limit,
-        has_next=skip + limit < total,
-        has_prev=skip > 0,
+    return set_validators(
+        SchemaJSONResponse(
+            PaginationResponse[UserInDB](
+                data=from_rows(UserInDB, page.items), meta=meta
+            )
+        ),
+        etag,
     )
 
-    return PaginationResponse(data=users, meta=meta)
+
+_EXPORT_FIELDS = list(UserInDB.model_fields)
+_EXPORT_FLUSH_BYTES = 64 * 1024
+
+
+async def _export_rows(
+    user_service: UserService, export_format: Literal["ndjson", "csv"]
+) -> AsyncIterator[str]:
+    """Serialize every user, flushing roughly every ``_EXPORT_FLUSH_BYTES``"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=_EXPORT_FIELDS)
+    if export_format == "csv":
+        writer.writeheader()
+
+    # aclosing releases the server-side cursor if the client disconnects
+    async with aclosing(user_service.stream_users()) as users:
+        async for user in users:
+            row = from_row(UserInDB, user).model_dump(mode="json")
+            if export_format == "csv":
+                writer.writerow(row)
+            else:
+                buffer.write(json.dumps(row, separators=(",", ":")))
+                buffer.write("\n")
+
+            if buffer.tell() >= _EXPORT_FLUSH_BYTES:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_users(
+    export_format: Literal["ndjson", "csv"] = Query("ndjson", alias="format"),
+    user_service: UserService = _user_service,
+):
+    """Stream every user as NDJSON or CSV"""
+    media_type = "text/csv" if export_format == "csv" else "application/x-ndjson"
+
+    return StreamingResponse(
+        _export_rows(user_service, export_format),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="users.{export_format}"'
+        },
+    )
 
 
 @router.post("/", response_model=ResponseBase[UserInDB])
@@ -38,4 +235,133 @@ async def create_user(
     """Create and user"""
     user = await user_service.create_user(email=user.email, password=user.password)
 
-    return ResponseBase.success_response(data=user)
+    return SchemaJSONResponse(
+        ResponseBase[UserInDB].success_response(data=from_row(UserInDB, user))
+    )
+
+
+@router.post(
+    "/bulk",
+    response_model=ResponseBase[UserBulkCreateResult],
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": {
+                        "type": "array",
+                        "items": {"$ref": "#/components/schemas/UserCreate"},
+                    }
+                },
+                "application/x-ndjson": {
+                    "schema": {"$ref": "#/components/schemas/UserCreate"}
+                },
+            },
+        }
+    },
+)
+async def create_users_bulk(
+    request: Request,
+    user_service: UserService = _bulk_user_service,
+):
+    """Create many users from a JSON array or a streamed NDJSON body
+
+    Each chunk is committed as soon as it is written, so a long import
+    neither holds a transaction open nor keeps its rows in memory.
+    """
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith(_NDJSON_TYPES):
+        rows = _iter_ndjson(request)
+    else:
+        rows = _iter_json_array(request)
+
+    result = await user_service.create_users_bulk(rows)
+
+    return SchemaJSONResponse(
+        ResponseBase[UserBulkCreateResult].success_response(data=result)
+    )
+
+
+@router.patch("/", response_model=ResponseBase[list[UserInDB]])
+async def update_users(
+    payload: UserBulkUpdate,
+    user_service: UserService = _user_service,
+):
+    """Update every user matching a filter in one statement"""
+    users = await user_service.update_users(payload.where, is_active=payload.is_active)
+
+    return SchemaJSONResponse(
+        ResponseBase[list[UserInDB]].success_response(
+            data=from_rows(UserInDB, users), message=f"{len(users)} users updated"
+        )
+    )
+
+
+@router.delete("/", response_model=ResponseBase[list[UserInDB]])
+async def delete_users(
+    ids: Annotated[list[UUID] | None, Query()] = None,
+    is_active: bool | None = None,
+    user_service: UserService = _user_service,
+):
+    """Delete every user matching a filter in one statement"""
+    users = await user_service.delete_users(UserFilter(ids=ids, is_active=is_active))
+
+    return SchemaJSONResponse(
+        ResponseBase[list[UserInDB]].success_response(
+            data=from_rows(UserInDB, users), message=f"{len(users)} users deleted"
+        )
+    )
+
+
+@router.get("/{user_id}", response_model=ResponseBase[UserInDB])
+async def get_user(
+    user_id: UUID,
+    request: Request,
+    user_service: UserService = _user_service,
+):
+    """Get a user, answering 304 when the client's ETag is current"""
+    user = await user_service.get_user(user_id)
+    if user is None:
+        raise EntityNotFoundError("User", user_id)
+
+    etag = make_etag("user", user.id, user.updated_at.isoformat())
+    if is_not_modified(request, etag, user.updated_at):
+        return not_modified(etag, user.updated_at)
+
+    return set_validators(
+        SchemaJSONResponse(
+            ResponseBase[UserInDB].success_response(data=from_row(UserInDB, user))
+        ),
+        etag,
+        user.updated_at,
+    )
+
+
+@router.patch("/{user_id}", response_model=ResponseBase[UserInDB])
+async def update_user(
+    user_id: UUID,
+    payload: UserUpdate,
+    user_service: UserService = _user_service,
+):
+    """Update a user"""
+    user = await user_service.update_user(
+        user_id, **payload.model_dump(exclude_unset=True)
+    )
+    if user is None:
+        raise EntityNotFoundError("User", user_id)
+
+    return SchemaJSONResponse(
+        ResponseBase[UserInDB].success_response(data=from_row(UserInDB, user))
+    )
+
+
+@router.delete("/{user_id}", response_model=ResponseBase)
+async def delete_user(
+    user_id: UUID,
+    user_service: UserService = _user_service,
+):
+    """Delete a user"""
+    if not await user_service.delete_user(user_id):
+        raise EntityNotFoundError("User", user_id)
+
+    return ResponseBase.success_response(data=None, message="User deleted")
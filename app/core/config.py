@@ -1,8 +1,17 @@
 from functools import lru_cache
-from typing import Literal
+from typing import Annotated, Literal
 
-from pydantic import field_validator
-from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic import Field, field_validator
+from pydantic_settings import BaseSettings, NoDecode, SettingsConfigDict
+
+
+def _to_async_url(url: str) -> str:
+    """Convert postgres:// to postgresql+asyncpg:// if needed"""
+    if url.startswith("postgres://"):
+        return url.replace("postgres://", "postgresql+asyncpg://", 1)
+    elif url.startswith("postgresql://"):
+        return url.replace("postgresql://", "postgresql+asyncpg://", 1)
+    return url
 
 
 class GlobalSettings(BaseSettings):
@@ -22,20 +31,40 @@ class GlobalSettings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
     REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    TOKEN_CACHE_MAX_SIZE: int = 10_000
+
+    # Password hashing (bcrypt runs outside the event loop)
+    PASSWORD_HASH_EXECUTOR: Literal["thread", "process"] = "thread"
+    PASSWORD_HASH_WORKERS: int | None = None
+    PASSWORD_HASH_MAX_QUEUE: int = 64
 
     # Database
     DATABASE_URL: str
-    SYNC_DATABASE_URL: str | None = None
+    SYNC_DATABASE_URL: Annotated[str | None, Field(validate_default=True)] = None
+    # On startup: create missing tables, check the Alembic revision in one
+    # query, or do nothing. Defaults to create_all in development only.
+    DB_SCHEMA_STARTUP: Annotated[
+        Literal["create_all", "check", "skip"] | None, Field(validate_default=True)
+    ] = None
+
+    # Alembic configuration the schema check finds the migrations through
+    ALEMBIC_CONFIG: str = "alembic.ini"
+
+    # Connection pool
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 300
+    DB_POOL_PRE_PING: bool = True
+    DB_COMMAND_TIMEOUT: float | None = 60.0
+    # Log every SQL statement through the sqlalchemy.engine logger
+    DB_ECHO: bool = False
 
     @field_validator("DATABASE_URL")
     @classmethod
     def validate_database_url(cls, v: str) -> str:
         """Convert postgres:// to postgresql+asyncpg:// if needed"""
-        if v.startswith("postgres://"):
-            return v.replace("postgres://", "postgresql+asyncpg://", 1)
-        elif v.startswith("postgresql://"):
-            return v.replace("postgresql://", "postgresql+asyncpg://", 1)
-        return v
+        return _to_async_url(v)
 
     @field_validator("SYNC_DATABASE_URL")
     @classmethod
@@ -54,6 +83,50 @@ class GlobalSettings(BaseSettings):
 
         return db_url
 
+    @field_validator("DB_SCHEMA_STARTUP")
+    @classmethod
+    def default_schema_startup(cls, v: str | None, info) -> str:
+        if v:
+            return v
+        return (
+            "create_all" if info.data.get("ENVIRONMENT") == "development" else "check"
+        )
+
+    # Read replicas, reads fall back to DATABASE_URL when none is healthy
+    DATABASE_READ_URLS: Annotated[list[str], NoDecode] = []
+    DB_REPLICA_STRATEGY: Literal["round_robin", "least_connections"] = "round_robin"
+    DB_REPLICA_MAX_LAG: float = 5.0
+    DB_REPLICA_CHECK_INTERVAL: float = 10.0
+    DB_REPLICA_EJECT_SECONDS: float = 30.0
+
+    @field_validator("DATABASE_READ_URLS", mode="before")
+    @classmethod
+    def assemble_read_urls(cls, v) -> list[str]:
+        """Accept a comma separated list and convert each URL to asyncpg"""
+        if isinstance(v, str):
+            v = [i.strip() for i in v.split(",") if i.strip()]
+        return [_to_async_url(url) for url in v or []]
+
+    # Background database health probe read by the health endpoints
+    HEALTH_CHECK_INTERVAL: float = 5.0
+    HEALTH_CHECK_TIMEOUT: float = 2.0
+
+    # Pagination
+    PAGINATION_COUNT_CACHE_TTL: float = 30.0
+
+    # Entity cache for repository lookups by id/unique fields
+    ENTITY_CACHE_ENABLED: bool = False
+    ENTITY_CACHE_MAX_SIZE: int = 10_000
+    ENTITY_CACHE_TTL: float = 60.0
+
+    # Coalesce concurrent identical repository lookups into one query
+    SINGLE_FLIGHT_ENABLED: bool = True
+
+    # Bulk operations
+    BULK_INSERT_CHUNK_SIZE: int = 1000
+    BULK_CREATE_MAX_ROWS: int = 100_000
+    EXPORT_FETCH_SIZE: int = 1000
+
     # CORS origins
     BACKEND_CORS_ORIGINS: list[str] | None = []
 
@@ -68,6 +141,65 @@ class GlobalSettings(BaseSettings):
 
     # Logging
     LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: Literal["text", "json"] = "text"
+    LOG_ENQUEUE: bool = True
+    # Per logger, e.g. "sqlalchemy.engine=0.1": fraction of records kept
+    LOG_SAMPLING: Annotated[dict[str, float], NoDecode] = {}
+    # Per logger, e.g. "app.services=100": records per second
+    LOG_RATE_LIMITS: Annotated[dict[str, float], NoDecode] = {}
+
+    @field_validator(
+        "LOG_SAMPLING",
+        "LOG_RATE_LIMITS",
+        "COMPRESSION_LEVELS",
+        "ADMISSION_ROUTE_LIMITS",
+        mode="before",
+    )
+    @classmethod
+    def assemble_key_values(cls, v) -> dict[str, float]:
+        """Accept a comma separated list of ``name=value`` pairs"""
+        if isinstance(v, str):
+            pairs = (i.split("=", 1) for i in v.split(",") if i.strip())
+            return {name.strip(): float(value) for name, value in pairs}
+        return v or {}
+
+    # Response compression (gzip/deflate, plus br/zstd when installed)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MINIMUM_SIZE: int = 1024
+    COMPRESSION_LEVEL: int = 6
+    # Per content type, e.g. "application/x-ndjson=1,text/csv=1"
+    COMPRESSION_LEVELS: Annotated[dict[str, int], NoDecode] = {}
+
+    # Prometheus metrics served at /metrics
+    METRICS_ENABLED: bool = True
+
+    # Per-request SQL profiling headers and slow/N+1 warnings
+    QUERY_PROFILER_ENABLED: bool = False
+    QUERY_PROFILER_MAX_QUERIES: int = 20
+    QUERY_PROFILER_MAX_DURATION_MS: float = 200.0
+    QUERY_PROFILER_REPEAT_THRESHOLD: int = 5
+
+    # Admission control: requests beyond the limit queue, then get a 503
+    ADMISSION_ENABLED: bool = True
+    # Defaults to the primary pool capacity, DB_POOL_SIZE + DB_MAX_OVERFLOW
+    ADMISSION_MAX_CONCURRENCY: int | None = None
+    ADMISSION_MAX_QUEUE: int = 100
+    ADMISSION_QUEUE_TIMEOUT: float = 5.0
+    # Per path prefix, e.g. "/v1/users/export=2,/v1/users/bulk=4"
+    ADMISSION_ROUTE_LIMITS: Annotated[dict[str, int], NoDecode] = {}
+    ADMISSION_EXEMPT_PATHS: Annotated[list[str], NoDecode] = ["/health", "/metrics"]
+
+    @field_validator("ADMISSION_EXEMPT_PATHS", mode="before")
+    @classmethod
+    def assemble_exempt_paths(cls, v) -> list[str]:
+        if isinstance(v, str):
+            return [i.strip() for i in v.split(",") if i.strip()]
+        return v or []
+
+    # Per client address token bucket, answered with 429
+    RATE_LIMIT_ENABLED: bool = False
+    RATE_LIMIT_PER_SECOND: float = 20.0
+    RATE_LIMIT_BURST: int = 40
 
     model_config = SettingsConfigDict(
         env_file=".env", case_sensitive=True, extra="ignore"
@@ -1,9 +1,10 @@
 from collections.abc import AsyncGenerator
 
-from fastapi import Depends
+from fastapi import Depends, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.session import get_db
+from app.db.unit_of_work import UnitOfWork
 
 
 # Database dependency
@@ -15,3 +16,22 @@ async def get_database() -> AsyncGenerator[AsyncSession, None]:
 
 # Type alias for cleaner code
 DatabaseDep = Depends(get_database)
+
+
+async def get_unit_of_work(
+    request: Request, db: AsyncSession = DatabaseDep
+) -> AsyncGenerator[UnitOfWork, None]:
+    """Unit of work dependency, one transaction for the whole request.
+
+    Committed by ``UnitOfWorkRoute`` before the response is sent; this only
+    cleans up, rolling back whatever was left uncommitted.
+    """
+    unit_of_work = UnitOfWork(db)
+    request.state.unit_of_work = unit_of_work
+    try:
+        yield unit_of_work
+    finally:
+        await unit_of_work.close()
+
+
+UnitOfWorkDep = Depends(get_unit_of_work)
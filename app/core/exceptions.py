@@ -4,10 +4,17 @@ from typing import Any
 class AppError(Exception):
     """Base exception for all application errors"""
 
-    def __init__(self, message, status_code: int = 500, detail: Any = None):
+    def __init__(
+        self,
+        message,
+        status_code: int = 500,
+        detail: Any = None,
+        headers: dict[str, str] | None = None,
+    ):
         self.message = message
         self.status_code = status_code
         self.detail = detail
+        self.headers = headers
         super().__init__(self.message)
 
 
@@ -54,3 +61,29 @@ class DuplicateEntityError(AppError):
             status_code=409,
             detail={"entity": entity, "field": field, "value": str(value)},
         )
+
+
+class ServiceUnavailableError(AppError):
+    """Raised when the server is too busy to accept more work"""
+
+    def __init__(
+        self, message: str = "Service temporarily overloaded", retry_after: int = 1
+    ):
+        super().__init__(
+            message,
+            status_code=503,
+            detail={"retry_after": retry_after},
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+class RateLimitExceededError(AppError):
+    """Raised when a client sends requests faster than it is allowed to"""
+
+    def __init__(self, retry_after: int = 1):
+        super().__init__(
+            "Too many requests",
+            status_code=429,
+            detail={"retry_after": retry_after},
+            headers={"Retry-After": str(retry_after)},
+        )
@@ -1,23 +1,322 @@
+import asyncio
+import json
+import logging
+import queue
+import random
 import sys
+import threading
+import time
+import traceback
+from collections.abc import Callable
 from pathlib import Path
 
 from loguru import logger
 
 from app.core.config import get_setting
+from app.core.metrics import registry
 
 _settings = get_setting()
 
+_TEXT_FORMAT = (
+    "{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}"
+)
+_COLOR_FORMAT = "<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+
+# Records at or above this level are never sampled nor rate limited
+_ALWAYS_KEEP = logging.WARNING
+
+# Extra key of the records a BackgroundSink writes into a file sink
+_BACKGROUND = "_background_sink"
+_BATCH_SIZE = 512
+_FLUSH_INTERVAL = 0.05
+_STOP = object()
+
+LOG_RECORDS_DROPPED = registry.counter(
+    "log_records_dropped_total",
+    "Log records dropped by sampling or rate limits",
+    ("logger",),
+)
+
+
+def _json_format(record) -> str:
+    """Serialize the record as one JSON object per line"""
+    payload = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "logger": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+        "message": record["message"],
+    }
+    extra = {k: v for k, v in record["extra"].items() if not k.startswith("_")}
+    if extra:
+        payload["extra"] = extra
+    if record["exception"] is not None:
+        exc_type, exc_value, exc_traceback = record["exception"]
+        payload["exception"] = "".join(
+            traceback.format_exception(exc_type, exc_value, exc_traceback)
+        )
+
+    record["extra"]["_json"] = json.dumps(payload, default=str)
+    return "{extra[_json]}\n"
+
+
+class _TokenBucket:
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        # Filters run on whichever thread logs
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+class LogSampler:
+    """Sink filter keeping a fraction of, or a rate of, a logger's records.
+
+    Rules match on the logger name and its dotted parents, so a rule for
+    ``sqlalchemy.engine`` covers ``sqlalchemy.engine.Engine``. Warnings and
+    errors always pass, records already formatted by a ``BackgroundSink``
+    never do. The decision is stored on the record so every sink
+    keeps or drops the same records.
+    """
+
+    def __init__(
+        self,
+        rates: dict[str, float] | None = None,
+        limits: dict[str, float] | None = None,
+    ):
+        self.rates = rates or {}
+        self.buckets = {
+            name: _TokenBucket(rate) for name, rate in (limits or {}).items()
+        }
+        self._rules: dict[str, tuple[str, float | None, _TokenBucket | None]] = {}
+
+    def _rule(self, name: str) -> tuple[str, float | None, _TokenBucket | None]:
+        rule = self._rules.get(name)
+        if rule is None:
+            rate = bucket = None
+            rate_name = bucket_name = ""
+            parts = name.split(".")
+            for i in range(len(parts), 0, -1):
+                prefix = ".".join(parts[:i])
+                if rate is None and prefix in self.rates:
+                    rate, rate_name = self.rates[prefix], prefix
+                if bucket is None and prefix in self.buckets:
+                    bucket, bucket_name = self.buckets[prefix], prefix
+            rule = self._rules[name] = (rate_name or bucket_name, rate, bucket)
+        return rule
+
+    def _keep(self, record) -> bool:
+        if record["level"].no >= _ALWAYS_KEEP:
+            return True
+
+        label, rate, bucket = self._rule(record["name"] or "")
+        if (rate is None or random.random() < rate) and (
+            bucket is None or bucket.take()
+        ):
+            return True
+
+        LOG_RECORDS_DROPPED.inc(label)
+        return False
+
+    def __call__(self, record) -> bool:
+        if _BACKGROUND in record["extra"]:
+            return False
+        if not self.rates and not self.buckets:
+            return True
+
+        keep = record["extra"].get("_sampled")
+        if keep is None:
+            keep = record["extra"]["_sampled"] = self._keep(record)
+        return keep
+
+
+class BackgroundSink:
+    """Loguru sink writing from a background thread.
+
+    ``write`` only queues the formatted message, the thread hands batches of
+    messages to ``target``. A full queue drops messages instead of blocking
+    the caller.
+    """
+
+    def __init__(self, target: Callable[[str], None], max_size: int = 10_000):
+        self.target = target
+        self._queue: queue.Queue = queue.Queue(max_size)
+        self._thread = threading.Thread(
+            target=self._run, name="log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def write(self, message) -> None:
+        try:
+            self._queue.put_nowait(str(message))
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc(message.record["name"] or "")
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < _BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            lines = [item for item in batch if isinstance(item, str)]
+            if lines:
+                try:
+                    self.target("".join(lines))
+                except Exception as e:
+                    print(f"Logging sink failed: {e!r}", file=sys.stderr)
+
+            for item in batch:
+                if isinstance(item, threading.Event):
+                    item.set()
+            if _STOP in batch:
+                return
+            if len(batch) < _BATCH_SIZE:
+                # Let messages accumulate, one write per batch is much
+                # cheaper than one per message
+                time.sleep(_FLUSH_INTERVAL)
+
+    def stop(self) -> None:
+        """Write what is queued and end the thread, called by ``logger.remove``"""
+        self._queue.put(_STOP)
+        self._thread.join(timeout=5)
+
+    async def complete(self) -> None:
+        """Wait until what is queued is written, awaited by ``logger.complete``"""
+        written = threading.Event()
+        self._queue.put(written)
+        await asyncio.to_thread(written.wait, 5)
+
+
+def _stream_writer(stream) -> Callable[[str], None]:
+    def write(text: str) -> None:
+        stream.write(text)
+        stream.flush()
+
+    return write
+
+
+def _file_writer(path: Path, **options) -> Callable[[str], None]:
+    """Writer forwarding text to a loguru file sink reserved for it, which
+    keeps rotation, retention and compression on the writer thread"""
+    key = str(path)
+    logger.add(
+        path,
+        format="{message}",
+        level=0,
+        filter=lambda record: record["extra"].get(_BACKGROUND) == key,
+        **options,
+    )
+    writer = logger.bind(**{_BACKGROUND: key}).opt(raw=True)
+
+    def write(text: str) -> None:
+        writer.log("TRACE", text)
+
+    return write
+
+
+def _add_sink(
+    target, *, format, level, filter, colorize: bool = False, **file_options
+) -> None:
+    """Add a sink, written from a background thread when LOG_ENQUEUE is set"""
+    if not _settings.LOG_ENQUEUE:
+        logger.add(
+            target,
+            format=format,
+            level=level,
+            filter=filter,
+            colorize=colorize,
+            **file_options,
+        )
+        return
+
+    writer = (
+        _file_writer(target, **file_options)
+        if isinstance(target, Path)
+        else _stream_writer(target)
+    )
+    logger.add(
+        BackgroundSink(writer),
+        format=format,
+        level=level,
+        filter=filter,
+        colorize=colorize,
+    )
+
+
+class InterceptHandler(logging.Handler):
+    """Forward stdlib records to loguru.
+
+    The origin of the record is copied from the stdlib record instead of
+    being found by walking the stack. ``Handler.handle`` holds the handler
+    lock around ``emit``, so the record being forwarded can be handed to
+    the patcher through an attribute.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._levels: dict[str, str | int] = {}
+        self._current: logging.LogRecord | None = None
+        self._logger = logger.patch(self._patch)
+
+    def _patch(self, record) -> None:
+        source = self._current
+        if source is not None:
+            record["name"] = source.name
+            record["function"] = source.funcName
+            record["line"] = source.lineno
+
+    def _level(self, record: logging.LogRecord) -> str | int:
+        level = self._levels.get(record.levelname)
+        if level is None:
+            try:
+                level = logger.level(record.levelname).name
+            except ValueError:
+                level = record.levelno
+            self._levels[record.levelname] = level
+        return level
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self._current = record
+        try:
+            if record.exc_info:
+                self._logger.opt(exception=record.exc_info).log(
+                    self._level(record), record.getMessage()
+                )
+            else:
+                self._logger.log(self._level(record), record.getMessage())
+        finally:
+            self._current = None
+
 
 def setup_logging():
     """Configure loguru logger bases on environment"""
 
     logger.remove()
 
-    logger.add(
+    json_mode = _settings.LOG_FORMAT == "json"
+    file_format = _json_format if json_mode else _TEXT_FORMAT
+    sampler = LogSampler(_settings.LOG_SAMPLING, _settings.LOG_RATE_LIMITS)
+
+    _add_sink(
         sys.stdout,
-        format="<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>",
+        format=_json_format if json_mode else _COLOR_FORMAT,
         level=_settings.LOG_LEVEL,
-        colorize=True,
+        colorize=not json_mode,
+        filter=sampler,
     )
 
     if _settings.ENVIRONMENT == "production":
@@ -25,20 +324,22 @@ def setup_logging():
         log_path.mkdir(exist_ok=True)
 
         # Error logs
-        logger.add(
+        _add_sink(
             log_path / "error.log",
-            format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
+            format=file_format,
             level="ERROR",
+            filter=sampler,
             rotation="10 MB",
             retention="30 days",
             compression="zip",
         )
 
         # All logs (with rotation)
-        logger.add(
+        _add_sink(
             log_path / "app.log",
-            format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
+            format=file_format,
             level="INFO",
+            filter=sampler,
             rotation="50 MB",
             retention="7 days",
             compression="zip",
@@ -49,43 +350,23 @@ def setup_logging():
         log_path = Path("logs")
         log_path.mkdir(exist_ok=True)
 
-        logger.add(
+        _add_sink(
             log_path / "dev.log",
-            format="{time:YYYY-MM-DD HH:mm:ss} | {level: <8} | {name}:{function}:{line} - {message}",
+            format=file_format,
             level="DEBUG",
+            filter=sampler,
             rotation="10 MB",
             retention="3 days",
         )
 
-    # Intercept standard logging (for SQLAlchemy, uvicorn, etc.)
-    import logging
-
-    class InterceptHandler(logging.Handler):
-        def emit(self, record):
-            # Get corresponding Loguru level
-            try:
-                level = logger.level(record.levelname).name
-            except ValueError:
-                level = record.levelno
-
-            # Find caller
-            frame, depth = logging.currentframe(), 2
-            while frame.f_code.co_filename == logging.__file__:  # type: ignore
-                frame = frame.f_back  # type: ignore
-                depth += 1
-
-            logger.opt(depth=depth, exception=record.exc_info).log(
-                level, record.getMessage()
-            )
-
-    # Replace handlers for standard logging
+    # Replace handlers for standard logging (for SQLAlchemy, uvicorn, etc.)
     logging.basicConfig(handlers=[InterceptHandler()], level=0, force=True)
 
     # Adjust log levels for third-party libraries
     logging.getLogger("uvicorn").setLevel(logging.INFO)
     logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
     logging.getLogger("sqlalchemy.engine").setLevel(
-        logging.INFO if _settings.ENVIRONMENT == "development" else logging.WARNING
+        logging.INFO if _settings.DB_ECHO else logging.WARNING
     )
 
     logger.info(f"Logging configured for {_settings.ENVIRONMENT} environment")
@@ -0,0 +1,259 @@
+"""In-process metrics rendered in the Prometheus text exposition format.
+
+Most updates happen on the event loop thread, but not all: loguru filters
+and sinks count dropped records on whichever thread logs. Each collector
+guards its values with a lock, uncontended on the event loop, so an
+observation costs a lock, a dict lookup and a bisect.
+"""
+
+import math
+import threading
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from contextlib import contextmanager
+
+# Latency buckets in seconds, from sub-millisecond queries to slow requests
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)
+    )
+    return f"{{{pairs}}}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if isinstance(value, int) or value.is_integer():
+        return str(int(value))
+    return repr(value)
+
+
+class _Metric(ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(labels)
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def _samples(self) -> Iterator[str]:
+        """Sample lines of the metric, after its HELP and TYPE lines"""
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {_escape(self.documentation)}"
+        yield f"# TYPE {self.name} {self.kind}"
+        yield from self._samples()
+
+
+class Counter(_Metric):
+    """Monotonic counter, one value per label combination"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def _samples(self) -> Iterator[str]:
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            yield (
+                f"{self.name}{_format_labels(self.label_names, labels)} "
+                f"{_format_value(value)}"
+            )
+
+
+class Gauge(Counter):
+    """Value going up and down, or read from ``callback`` at scrape time"""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        callback: Callable[[], Iterable[tuple[tuple[str, ...], float]]] | None = None,
+    ):
+        super().__init__(name, documentation, labels)
+        self.callback = callback
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) - amount
+
+    def set(self, value: float, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def _samples(self) -> Iterator[str]:
+        if self.callback is not None:
+            values = dict(self.callback())
+            with self._lock:
+                self._values = values
+        yield from super()._samples()
+
+
+class Histogram(_Metric):
+    """Distribution of observations over fixed buckets"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label combination: [count per bucket..., count above, sum]
+        self._values: dict[tuple[str, ...], list[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        bucket = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._values.get(labels)
+            if series is None:
+                series = self._values[labels] = [0] * (len(self.buckets) + 2)
+            series[bucket] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(self, *labels: str) -> Iterator[None]:
+        """Observe the duration of the block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def count(self, *labels: str) -> int:
+        series = self._values.get(labels)
+        return int(sum(series[:-1])) if series else 0
+
+    def _samples(self) -> Iterator[str]:
+        bucket_labels = (*self.label_names, "le")
+        bounds = [_format_value(bound) for bound in (*self.buckets, math.inf)]
+        with self._lock:
+            values = [(labels, list(series)) for labels, series in self._values.items()]
+
+        for labels, series in values:
+            cumulative = 0
+            for bound, count in zip(bounds, series[:-1], strict=True):
+                cumulative += count
+                yield (
+                    f"{self.name}_bucket"
+                    f"{_format_labels(bucket_labels, (*labels, bound))} {cumulative}"
+                )
+            label_text = _format_labels(self.label_names, labels)
+            yield f"{self.name}_sum{label_text} {_format_value(series[-1])}"
+            yield f"{self.name}_count{label_text} {cumulative}"
+
+
+class MetricsRegistry:
+    """Collection of metrics exposed together"""
+
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> None:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self._metrics[metric.name] = metric
+
+    def counter(self, name: str, documentation: str, labels=()) -> Counter:
+        metric = Counter(name, documentation, labels)
+        self.register(metric)
+        return metric
+
+    def gauge(self, name: str, documentation: str, labels=(), callback=None) -> Gauge:
+        metric = Gauge(name, documentation, labels, callback)
+        self.register(metric)
+        return metric
+
+    def histogram(
+        self, name: str, documentation: str, labels=(), buckets=DEFAULT_BUCKETS
+    ) -> Histogram:
+        metric = Histogram(name, documentation, labels, buckets)
+        self.register(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = [line for metric in self._metrics.values() for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+HTTP_REQUESTS_IN_FLIGHT = registry.gauge(
+    "http_requests_in_flight", "Requests currently being served", ("method",)
+)
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds",
+    "Time to serve a request, by route template",
+    ("method", "route"),
+)
+HTTP_RESPONSES = registry.counter(
+    "http_responses_total",
+    "Responses sent, by status code",
+    ("method", "route", "status"),
+)
+
+DB_QUERY_DURATION = registry.histogram(
+    "db_query_duration_seconds", "Time spent executing SQL statements", ("database",)
+)
+DB_POOL_CHECKOUT_WAIT = registry.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time waited for a pooled connection, including opening new ones",
+    ("database",),
+)
+DB_POOL_TIMEOUTS = registry.counter(
+    "db_pool_timeouts_total", "Connection checkouts that timed out", ("database",)
+)
+
+PASSWORD_HASH_DURATION = registry.histogram(
+    "password_hash_duration_seconds",
+    "Time to hash or verify a password, including the wait for a worker",
+    ("operation",),
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
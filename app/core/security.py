@@ -1,26 +1,169 @@
+import asyncio
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any
+from typing import Any, TypeVar
 
 from fastapi import HTTPException, status
-from jose import JWTError, jwt
+from jose import JWTError, jwk, jwt
+from jose.backends.base import Key
 from passlib.context import CryptContext
 
 from app.core.config import get_setting
+from app.core.exceptions import ServiceUnavailableError
+from app.core.metrics import PASSWORD_HASH_DURATION, registry
 
 settings = get_setting()
 
+R = TypeVar("R")
+
 
 _SECRET_KEY = settings.SECRET_KEY
 _ALGORITHM = settings.ALGORITHM
 _ACCESS_TOKEN_EXPIRES_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 _REFRESH_TOKEN_EXPIRE_DAYS = settings.REFRESH_TOKEN_EXPIRE_DAYS
 
+_pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+# Module level so they can be pickled into a process pool
+def _hash_password(password: str) -> str:
+    return _pwd_context.hash(password)
+
+
+def _verify_password(plain_password: str, hashed_password: str) -> bool:
+    return _pwd_context.verify(plain_password, hashed_password)
+
+
+def _hash_passwords(passwords: list[str]) -> list[str]:
+    return [_pwd_context.hash(password) for password in passwords]
+
+
+class PasswordHasherPool:
+    """Bounded worker pool for CPU bound password hashing.
+
+    Jobs beyond ``workers + max_queue`` are rejected immediately with
+    ``ServiceUnavailableError`` instead of piling up behind the pool.
+    """
+
+    def __init__(
+        self,
+        kind: str = "thread",
+        workers: int | None = None,
+        max_queue: int = 64,
+    ):
+        self.kind = kind
+        self.workers = workers or os.cpu_count() or 1
+        self.max_queue = max_queue
+        self._executor: Executor | None = None
+        self._pending = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.max_queue
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix="password-hash"
+                )
+        return self._executor
+
+    async def run(self, func: Callable[..., R], *args: Any) -> R:
+        """Run ``func`` in the pool, failing fast when the queue is full"""
+        if self._pending >= self.capacity:
+            raise ServiceUnavailableError("Password hashing queue is full")
+
+        self._pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._pending -= 1
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def _prepare_keys(secret_key: str, algorithm: str) -> tuple[Key, Key]:
+    """Build the signing and verification keys once instead of per call"""
+    signing_key = jwk.construct(secret_key, algorithm)
+    if algorithm.startswith("HS"):
+        return signing_key, signing_key
+
+    return signing_key, signing_key.public_key()
+
+
+class VerifiedTokenCache:
+    """Bounded LRU of payloads whose signature was already verified.
+
+    Entries are keyed by a SHA-256 digest of the token so raw tokens are not
+    kept in memory. Time based claims are re-checked on every hit.
+    """
+
+    def __init__(self, max_size: int = 10_000):
+        self.max_size = max_size
+        self._entries: OrderedDict[bytes, dict] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> dict | None:
+        key = self._key(token)
+        payload = self._entries.get(key)
+        if payload is None:
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return payload
+
+    def set(self, token: str, payload: dict) -> None:
+        if self.max_size <= 0:
+            return
+
+        self._entries[self._key(token)] = payload
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
 
 class SecurityManager:
     """Security Manager"""
 
     def __init__(self):
-        self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        self.pwd_context = _pwd_context
+        self._signing_key, self._verification_key = _prepare_keys(
+            _SECRET_KEY, _ALGORITHM
+        )
+        self.token_cache = VerifiedTokenCache(max_size=settings.TOKEN_CACHE_MAX_SIZE)
+        self.hasher_pool = PasswordHasherPool(
+            kind=settings.PASSWORD_HASH_EXECUTOR,
+            workers=settings.PASSWORD_HASH_WORKERS,
+            max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+        )
         self.ALGORITHM = _ALGORITHM
         self.ACCESS_TOKEN_EXPIRE_MINUTES = _ACCESS_TOKEN_EXPIRES_MINUTES
         self.REFRESH_TOKEN_EXPIRE_DAYS = _REFRESH_TOKEN_EXPIRE_DAYS
@@ -34,7 +177,8 @@ class SecurityManager:
         Returns:
             str: Hashed password
         """
-        return self.pwd_context.hash(password)
+        with PASSWORD_HASH_DURATION.time("hash"):
+            return _hash_password(password)
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """Verify the hashed password
@@ -46,7 +190,66 @@ class SecurityManager:
         Returns:
             bool: It valid or not he password
         """
-        return self.pwd_context.verify(plain_password, hashed_password)
+        with PASSWORD_HASH_DURATION.time("verify"):
+            return _verify_password(plain_password, hashed_password)
+
+    async def hash_password_async(self, password: str) -> str:
+        """Generate hashed password without blocking the event loop
+
+        Args:
+            password (str): Password
+
+        Raises:
+            ServiceUnavailableError: The hashing queue is full
+
+        Returns:
+            str: Hashed password
+        """
+        with PASSWORD_HASH_DURATION.time("hash"):
+            return await self.hasher_pool.run(_hash_password, password)
+
+    async def hash_passwords_async(self, passwords: list[str]) -> list[str]:
+        """Hash many passwords in parallel, one job per pool worker
+
+        Args:
+            passwords (list[str]): Passwords
+
+        Raises:
+            ServiceUnavailableError: The hashing queue is full
+
+        Returns:
+            list[str]: Hashed passwords in the same order
+        """
+        if not passwords:
+            return []
+
+        size = -(-len(passwords) // self.hasher_pool.workers)
+        slices = [passwords[i : i + size] for i in range(0, len(passwords), size)]
+        with PASSWORD_HASH_DURATION.time("hash_batch"):
+            hashed = await asyncio.gather(
+                *(self.hasher_pool.run(_hash_passwords, batch) for batch in slices)
+            )
+        return [value for batch in hashed for value in batch]
+
+    async def verify_password_async(
+        self, plain_password: str, hashed_password: str
+    ) -> bool:
+        """Verify the hashed password without blocking the event loop
+
+        Args:
+            plain_password (str): Plain password
+            hashed_password (str): Hashed password to compare
+
+        Raises:
+            ServiceUnavailableError: The hashing queue is full
+
+        Returns:
+            bool: It valid or not he password
+        """
+        with PASSWORD_HASH_DURATION.time("verify"):
+            return await self.hasher_pool.run(
+                _verify_password, plain_password, hashed_password
+            )
 
     def create_access_token(
         self, subject: str | Any, expires_delta: timedelta | None = None
@@ -64,7 +267,7 @@ class SecurityManager:
             expires_delta or timedelta(minutes=_ACCESS_TOKEN_EXPIRES_MINUTES)
         )
         to_encode = {"sub": str(subject), "exp": expire}
-        return jwt.encode(to_encode, _SECRET_KEY, algorithm=_ALGORITHM)
+        return jwt.encode(to_encode, self._signing_key, algorithm=_ALGORITHM)
 
     def create_refresh_token(self, subject: str | Any) -> str:
         """Method to create the refresh token
@@ -89,13 +292,29 @@ class SecurityManager:
         Returns:
             Optional[dict]: Token decoded data
         """
+        # Only the expiration check can be replayed on a cached payload
+        cacheable = not options or set(options) <= {"verify_exp"}
+        verify_exp = (options or {}).get("verify_exp", True)
+
+        if cacheable:
+            payload = self.token_cache.get(token)
+            if payload is not None:
+                if not _claims_are_current(payload, verify_exp):
+                    return None
+                return dict(payload)
+
         try:
-            return jwt.decode(
-                token, _SECRET_KEY, algorithms=[_ALGORITHM], options=options
+            payload = jwt.decode(
+                token, self._verification_key, algorithms=[_ALGORITHM], options=options
             )
         except JWTError:
             return None
 
+        if cacheable:
+            self.token_cache.set(token, dict(payload))
+
+        return payload
+
     def get_token_data(self, token: str, ignore_expiration: bool = False) -> dict:
         """Get the token payload data
 
@@ -118,4 +337,19 @@ class SecurityManager:
         return payload
 
 
+def _claims_are_current(payload: dict, verify_exp: bool = True) -> bool:
+    """Re-check the time based claims of an already verified payload"""
+    now = time.time()
+    if verify_exp and "exp" in payload and payload["exp"] < now:
+        return False
+
+    return not ("nbf" in payload and payload["nbf"] > now)
+
+
 security_manager = SecurityManager()
+
+registry.gauge(
+    "password_hash_pending",
+    "Password hashing jobs running or queued",
+    callback=lambda: [((), security_manager.hasher_pool.pending)],
+)
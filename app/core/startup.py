@@ -0,0 +1,42 @@
+import time
+
+from loguru import logger
+
+import app
+
+
+class StartupTimings:
+    """Durations of the startup phases, from the first import of ``app``"""
+
+    def __init__(self, started: float):
+        self.started = started
+        self._last = started
+        self.phases: dict[str, float] = {}
+
+    def mark(self, phase: str) -> None:
+        """End ``phase`` now, it started where the previous one ended"""
+        now = time.perf_counter()
+        self.phases[phase] = now - self._last
+        self._last = now
+
+    @property
+    def total(self) -> float:
+        return self._last - self.started
+
+    def as_dict(self) -> dict[str, float]:
+        return {
+            **{
+                phase: round(seconds * 1000, 1)
+                for phase, seconds in self.phases.items()
+            },
+            "total": round(self.total * 1000, 1),
+        }
+
+    def report(self) -> None:
+        breakdown = ", ".join(
+            f"{phase} {seconds * 1000:.1f}ms" for phase, seconds in self.phases.items()
+        )
+        logger.info(f"Started in {self.total * 1000:.1f}ms ({breakdown})")
+
+
+startup_timings = StartupTimings(app.IMPORT_STARTED)
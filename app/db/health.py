@@ -0,0 +1,102 @@
+import asyncio
+import time
+from datetime import UTC, datetime
+
+from loguru import logger
+from sqlalchemy import text
+
+from app.core.config import get_setting
+from app.db.session import get_engine
+
+_settings = get_setting()
+
+
+class DatabaseHealth:
+    """Database status refreshed by a background prober.
+
+    Health endpoints read the cached result, so what probes cost the
+    database depends on ``interval`` and not on how often they are hit.
+    The server version is only queried until it is known.
+    """
+
+    def __init__(self, interval: float = 5.0, timeout: float = 2.0):
+        self.interval = interval
+        self.timeout = timeout
+        self.connected: bool | None = None
+        self.version: str | None = None
+        self.error: str | None = None
+        self.latency: float | None = None
+        self.checked_at: datetime | None = None
+        self._checked = 0.0
+        self._task: asyncio.Task | None = None
+
+    @property
+    def status(self) -> str:
+        if self.connected is None:
+            return "unknown"
+        return "connected" if self.connected else "disconnected"
+
+    @property
+    def ready(self) -> bool:
+        """Connected at the last probe, and that probe is recent"""
+        return bool(self.connected) and (
+            time.monotonic() - self._checked < self.interval * 3
+        )
+
+    async def _query(self) -> None:
+        async with get_engine().connect() as conn:
+            if self.version is None and conn.dialect.name == "postgresql":
+                version = (await conn.execute(text("SELECT version()"))).scalar_one()
+                self.version = version.split(",")[0]
+            else:
+                await conn.execute(text("SELECT 1"))
+
+    async def probe(self) -> None:
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._query(), self.timeout)
+        except Exception as e:
+            if self.connected is not False:
+                logger.warning(f"Database health probe failed: {e!r}")
+            self.connected = False
+            self.error = repr(e) if isinstance(e, TimeoutError) else str(e)
+        else:
+            if self.connected is False:
+                logger.info("Database health probe recovered")
+            self.connected = True
+            self.error = None
+        self.latency = time.perf_counter() - start
+        self._checked = time.monotonic()
+        self.checked_at = datetime.now(UTC)
+
+    async def _run(self) -> None:
+        while True:
+            await self.probe()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="database-health")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def as_dict(self) -> dict:
+        return {
+            "status": self.status,
+            "version": self.version,
+            "error": self.error,
+            "latency_ms": round(self.latency * 1000, 2) if self.latency else None,
+            "checked_at": self.checked_at.isoformat() if self.checked_at else None,
+        }
+
+
+database_health = DatabaseHealth(
+    interval=_settings.HEALTH_CHECK_INTERVAL, timeout=_settings.HEALTH_CHECK_TIMEOUT
+)
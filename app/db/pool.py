@@ -0,0 +1,85 @@
+import time
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+from app.core.metrics import DB_POOL_CHECKOUT_WAIT, DB_POOL_TIMEOUTS
+
+
+class PoolStats:
+    """Running counters of connection checkouts, exported as metrics under
+    the ``database`` label"""
+
+    def __init__(self, database: str = "primary"):
+        self.database = database
+        self.checkouts = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        self.checkouts += 1
+        self.total_wait += seconds
+        self.max_wait = max(self.max_wait, seconds)
+        DB_POOL_CHECKOUT_WAIT.observe(seconds, self.database)
+
+    def record_timeout(self) -> None:
+        self.timeouts += 1
+        DB_POOL_TIMEOUTS.inc(self.database)
+
+    def as_dict(self) -> dict[str, float | int]:
+        return {
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "avg_wait_ms": self.total_wait / self.checkouts * 1000
+            if self.checkouts
+            else 0.0,
+            "max_wait_ms": self.max_wait * 1000,
+        }
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited.
+
+    The wait includes opening a new connection when the pool has to grow.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.stats.record_timeout()
+            raise
+
+        self.stats.record_wait(time.perf_counter() - start)
+        return connection
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+def get_pool_status(pool: Pool) -> dict[str, float | int | str]:
+    """Snapshot of the pool occupancy and checkout wait times"""
+    status: dict[str, float | int | str] = {"class": type(pool).__name__}
+
+    if isinstance(pool, AsyncAdaptedQueuePool):
+        status.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            idle=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout(),
+        )
+
+    if isinstance(pool, InstrumentedQueuePool):
+        status.update(pool.stats.as_dict())
+
+    return status
@@ -0,0 +1,57 @@
+import re
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# IN lists expand to one placeholder per value, fold them into one shape
+_IN_LIST = re.compile(
+    r"\(\s*(?:[?%]\S*|\$\d+|:\w+)(?:\s*,\s*(?:[?%]\S*|\$\d+|:\w+))+\s*\)"
+)
+
+
+class QueryProfile:
+    """SQL statements executed while serving one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Counter[str] = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> list[tuple[str, int]]:
+        """Statement shapes executed at least ``threshold`` times"""
+        shapes: Counter[str] = Counter()
+        for statement, count in self.statements.items():
+            shapes[_IN_LIST.sub("(...)", " ".join(statement.split()))] += count
+        return [
+            (shape, count)
+            for shape, count in shapes.most_common()
+            if count >= threshold
+        ]
+
+
+_current_profile: ContextVar[QueryProfile | None] = ContextVar(
+    "query_profile", default=None
+)
+
+
+@contextmanager
+def profile_queries() -> Iterator[QueryProfile]:
+    """Profile the queries issued inside the block, tasks it spawns included"""
+    profile = QueryProfile()
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+
+
+def record_query(statement: str, duration: float) -> None:
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.record(statement, duration)
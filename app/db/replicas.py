@@ -0,0 +1,144 @@
+import asyncio
+import itertools
+import time
+
+from loguru import logger
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Seconds the replica is behind the primary, 0 when it has replayed all it got
+_LAG_QUERY = text(
+    "SELECT CASE "
+    "WHEN NOT pg_is_in_recovery() THEN 0 "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "END"
+)
+
+
+class Replica:
+    """A read replica engine and its health"""
+
+    def __init__(self, engine: AsyncEngine):
+        self.engine = engine
+        self.lag: float | None = None
+        self.ejected_until = 0.0
+        self.last_error: str | None = None
+
+    @property
+    def name(self) -> str:
+        return self.engine.url.render_as_string(hide_password=True)
+
+    @property
+    def healthy(self) -> bool:
+        return self.ejected_until <= time.monotonic()
+
+    def eject(self, seconds: float, reason: str) -> None:
+        if self.healthy:
+            logger.warning(f"Ejecting read replica {self.name}: {reason}")
+        self.ejected_until = time.monotonic() + seconds
+        self.last_error = reason
+
+    def restore(self) -> None:
+        if not self.healthy:
+            logger.info(f"Read replica {self.name} is back in rotation")
+        self.ejected_until = 0.0
+        self.last_error = None
+
+
+class ReplicaSet:
+    """Chooses a healthy replica for read queries.
+
+    Replicas are ejected for ``eject_seconds`` when a connection to them
+    fails, and while the background prober sees them lagging more than
+    ``max_lag`` seconds behind the primary.
+    """
+
+    def __init__(
+        self,
+        engines: list[AsyncEngine],
+        strategy: str = "round_robin",
+        max_lag: float = 5.0,
+        check_interval: float = 10.0,
+        eject_seconds: float = 30.0,
+    ):
+        self.replicas = [Replica(engine) for engine in engines]
+        self.strategy = strategy
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.eject_seconds = eject_seconds
+        self._cycle = itertools.cycle(self.replicas)
+        self._task: asyncio.Task | None = None
+
+        for replica in self.replicas:
+            self._watch_errors(replica)
+
+    def _watch_errors(self, replica: Replica) -> None:
+        @event.listens_for(replica.engine.sync_engine, "handle_error")
+        def _on_error(context):
+            if context.is_disconnect:
+                replica.eject(self.eject_seconds, str(context.original_exception))
+
+    def choose(self) -> Replica | None:
+        """Healthy replica to read from, ``None`` to use the primary"""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            return None
+
+        if self.strategy == "least_connections":
+            return min(healthy, key=lambda replica: replica.engine.pool.checkedout())
+
+        for _ in range(len(self.replicas)):
+            replica = next(self._cycle)
+            if replica.healthy:
+                return replica
+
+        return None
+
+    async def probe(self) -> None:
+        """Measure the lag of every replica, ejecting failing or late ones"""
+        for replica in self.replicas:
+            try:
+                async with replica.engine.connect() as conn:
+                    replica.lag = float((await conn.execute(_LAG_QUERY)).scalar_one())
+            except Exception as e:
+                replica.eject(self.eject_seconds, str(e))
+                continue
+
+            if replica.lag > self.max_lag:
+                replica.eject(self.check_interval, f"lagging {replica.lag:.1f}s")
+            else:
+                replica.restore()
+
+    async def _run(self) -> None:
+        while True:
+            await self.probe()
+            await asyncio.sleep(self.check_interval)
+
+    def start(self) -> None:
+        if self.replicas and self._task is None:
+            self._task = asyncio.create_task(self._run(), name="replica-prober")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    def status(self) -> list[dict]:
+        return [
+            {
+                "url": replica.name,
+                "healthy": replica.healthy,
+                "lag_seconds": replica.lag,
+                "checked_out": replica.engine.pool.checkedout(),
+                "last_error": replica.last_error,
+            }
+            for replica in self.replicas
+        ]
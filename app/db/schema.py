@@ -0,0 +1,77 @@
+from pathlib import Path
+
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import get_setting
+
+_settings = get_setting()
+
+
+class SchemaMismatchError(RuntimeError):
+    """The database is not migrated to the revision the code expects"""
+
+
+def migration_heads(config_file: str | Path | None = None) -> set[str]:
+    """Head revisions of the Alembic migrations.
+
+    Found through the ``script_location`` of the Alembic configuration
+    (``ALEMBIC_CONFIG``, ``alembic.ini`` by default), so they are read
+    wherever the migrations are deployed.
+
+    Raises:
+        SchemaMismatchError: The configuration or its migrations cannot be
+            found
+    """
+    # Imported here, Alembic's script machinery is slow to import and only
+    # the schema check needs it
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+    from alembic.util import CommandError
+
+    path = Path(config_file or _settings.ALEMBIC_CONFIG)
+    if not path.is_file():
+        raise SchemaMismatchError(
+            f"Alembic configuration {str(path.resolve())!r} not found, set "
+            "ALEMBIC_CONFIG or DB_SCHEMA_STARTUP=skip"
+        )
+
+    try:
+        heads = set(ScriptDirectory.from_config(Config(path)).get_heads())
+    except CommandError as e:
+        raise SchemaMismatchError(f"Cannot read the Alembic migrations: {e}") from e
+
+    if not heads:
+        raise SchemaMismatchError(f"No Alembic migrations found through {path}")
+    return heads
+
+
+async def check_schema(engine: AsyncEngine) -> set[str]:
+    """Compare the database revision with the migration heads, one query.
+
+    Raises:
+        SchemaMismatchError: The database is missing migrations, or has
+            revisions this code does not know about
+
+    Returns:
+        set[str]: The database revision
+    """
+    expected = migration_heads()
+
+    try:
+        async with engine.connect() as conn:
+            result = await conn.execute(text("SELECT version_num FROM alembic_version"))
+            current = set(result.scalars().all())
+    except DBAPIError as e:
+        raise SchemaMismatchError(
+            "Database is not under Alembic control, run `alembic upgrade head`"
+        ) from e
+
+    if current != expected:
+        raise SchemaMismatchError(
+            f"Database is at revision {', '.join(sorted(current)) or 'none'}, "
+            f"code expects {', '.join(sorted(expected))}; run `alembic upgrade head`"
+        )
+
+    return current
@@ -1,23 +1,141 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import time
+from functools import lru_cache
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import Session
 
 from app.core.config import get_setting
+from app.core.metrics import DB_QUERY_DURATION
+from app.db.pool import InstrumentedQueuePool
+from app.db.profiling import record_query
+from app.db.replicas import ReplicaSet
 
 _settings = get_setting()
 
-engine = create_async_engine(
-    _settings.DATABASE_URL,
-    echo=_settings.ENVIRONMENT == "development",
-    pool_pre_ping=True,
-    pool_recycle=300,
-)
+# Execution option set by repositories on queries that may run on a replica
+READ_REPLICA = "read_replica"
+# Session.info key set by the listeners below once a session has written
+HAS_WRITES = "has_writes"
+
+
+def _instrument(engine, database: str) -> None:
+    """Record the duration of every statement run on ``engine``, in the
+    metrics and in the profile of the current request"""
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _start_query(conn, cursor, statement, parameters, context, executemany):
+        context._query_started = time.perf_counter()
+
+    @event.listens_for(engine.sync_engine, "after_cursor_execute")
+    def _end_query(conn, cursor, statement, parameters, context, executemany):
+        duration = time.perf_counter() - context._query_started
+        DB_QUERY_DURATION.observe(duration, database)
+        record_query(statement, duration)
+
+    if isinstance(engine.pool, InstrumentedQueuePool):
+        engine.pool.stats.database = database
+
+
+def _create_engine(url: str, database: str = "primary"):
+    connect_args = (
+        {"command_timeout": _settings.DB_COMMAND_TIMEOUT}
+        if _settings.DB_COMMAND_TIMEOUT is not None
+        and url.startswith("postgresql+asyncpg://")
+        else {}
+    )
+
+    engine = create_async_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=_settings.DB_POOL_SIZE,
+        max_overflow=_settings.DB_MAX_OVERFLOW,
+        pool_timeout=_settings.DB_POOL_TIMEOUT,
+        pool_recycle=_settings.DB_POOL_RECYCLE,
+        pool_pre_ping=_settings.DB_POOL_PRE_PING,
+        connect_args=connect_args,
+    )
+    _instrument(engine, database)
+    return engine
+
+
+# Engines are built on first use: importing the app stays cheap and the
+# database driver is only loaded by processes that talk to the database
+@lru_cache
+def get_engine() -> AsyncEngine:
+    return _create_engine(_settings.DATABASE_URL)
+
+
+@lru_cache
+def get_replica_set() -> ReplicaSet:
+    return ReplicaSet(
+        [_create_engine(url, "replica") for url in _settings.DATABASE_READ_URLS],
+        strategy=_settings.DB_REPLICA_STRATEGY,
+        max_lag=_settings.DB_REPLICA_MAX_LAG,
+        check_interval=_settings.DB_REPLICA_CHECK_INTERVAL,
+        eject_seconds=_settings.DB_REPLICA_EJECT_SECONDS,
+    )
+
+
+class RoutingSession(Session):
+    """Session sending replica-safe reads to a read replica.
+
+    Once the session has written anything every query stays on the primary,
+    so a request always reads its own writes.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if (
+            clause is not None
+            and not self._flushing
+            and not self.info.get(HAS_WRITES)
+            and getattr(clause, "_execution_options", {}).get(READ_REPLICA)
+        ):
+            replica = get_replica_set().choose()
+            if replica is not None:
+                return replica.engine.sync_engine
+
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+
+def session_has_writes(session: Session | AsyncSession) -> bool:
+    """Whether ``session`` flushed or executed a write since it was opened.
+
+    Read this instead of the ``Session.info`` key: importing it registers
+    the listeners that set the flag.
+    """
+    return bool(session.info.get(HAS_WRITES))
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_flush_writes(session, flush_context):
+    session.info[HAS_WRITES] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _mark_statement_writes(orm_execute_state):
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        orm_execute_state.session.info[HAS_WRITES] = True
+
 
 AsyncSessionLocal = async_sessionmaker(
-    engine, class_=AsyncSession, expire_on_commit=False
+    class_=AsyncSession,
+    sync_session_class=RoutingSession,
+    expire_on_commit=False,
 )
 
 
 async def get_db():
-    async with AsyncSessionLocal() as session:
+    async with AsyncSessionLocal(bind=get_engine()) as session:
         try:
             yield session
         finally:
@@ -0,0 +1,65 @@
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+
+from sqlalchemy.ext.asyncio import AsyncSession, AsyncSessionTransaction
+
+from app.db.session import session_has_writes
+
+# Session.info key under which the active unit of work is registered
+UNIT_OF_WORK = "unit_of_work"
+
+
+class UnitOfWork:
+    """One transaction shared by every repository of a request.
+
+    While it is active repositories flush instead of committing, the work is
+    committed once by ``commit`` or discarded by ``rollback``. Callbacks
+    registered with ``on_commit`` (cache invalidation) run after the commit.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self._on_commit: list[Callable[[], Awaitable[None]]] = []
+        session.info[UNIT_OF_WORK] = self
+
+    @classmethod
+    def of(cls, session: AsyncSession) -> "UnitOfWork | None":
+        """The unit of work managing ``session``, if any"""
+        return session.info.get(UNIT_OF_WORK)
+
+    @property
+    def has_writes(self) -> bool:
+        return bool(
+            session_has_writes(self.session)
+            or self.session.new
+            or self.session.dirty
+            or self.session.deleted
+        )
+
+    def on_commit(self, callback: Callable[[], Awaitable[None]]) -> None:
+        self._on_commit.append(callback)
+
+    @asynccontextmanager
+    async def savepoint(self) -> AsyncIterator[AsyncSessionTransaction]:
+        """Nested transaction, rolled back alone if the block raises"""
+        async with self.session.begin_nested() as nested:
+            yield nested
+
+    async def commit(self) -> None:
+        """Commit the request's work, skipped when nothing was written"""
+        if self.has_writes:
+            await self.session.commit()
+
+        callbacks, self._on_commit = self._on_commit, []
+        for callback in callbacks:
+            await callback()
+
+    async def rollback(self) -> None:
+        self._on_commit.clear()
+        await self.session.rollback()
+
+    async def close(self) -> None:
+        """Detach from the session, rolling back anything left uncommitted"""
+        if self.session.in_transaction():
+            await self.rollback()
+        self.session.info.pop(UNIT_OF_WORK, None)
@@ -25,6 +25,7 @@ async def app_exception_handler(request: Request, exc: AppError):
             "detail": exc.detail,
             "path": str(request.url),
         },
+        headers=exc.headers,
     )
 
 
@@ -10,33 +10,63 @@ from app.api.router import api_router
 from app.core.config import get_setting
 from app.core.exceptions import AppError
 from app.core.logging import setup_logging
+from app.core.security import security_manager
+from app.core.startup import startup_timings
 from app.db.base import Base
-from app.db.session import engine
+from app.db.health import database_health
+from app.db.schema import check_schema
+from app.db.session import get_engine, get_replica_set
 from app.exceptions.handlers import (
     app_exception_handler,
     generic_exception_handler,
     integrity_error_handler,
     validation_exception_handler,
 )
+from app.middleware.admission import AdmissionMiddleware, admission_controller
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.profiler import QueryProfilerMiddleware
 
 _settings = get_setting()
 
+startup_timings.mark("import")
+
 
 async def create_db_and_tables():
-    async with engine.begin() as conn:
+    async with get_engine().begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
 
+async def prepare_database():
+    """Create or check the schema according to DB_SCHEMA_STARTUP"""
+    if _settings.DB_SCHEMA_STARTUP == "create_all":
+        await create_db_and_tables()
+    elif _settings.DB_SCHEMA_STARTUP == "check":
+        revision = await check_schema(get_engine())
+        logger.info(f"Database schema at revision {', '.join(sorted(revision))}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    startup_timings.mark("server")
     setup_logging()
     logger.info("🚀 Starting FastAPI application")
     logger.info(f"Environment: {_settings.ENVIRONMENT}")
     logger.info(f"Version: {_settings.VERSION}")
     logger.debug(f"Database URL: {_settings.DATABASE_URL[:50]}...")
-    await create_db_and_tables()
+    startup_timings.mark("logging")
+    await prepare_database()
+    startup_timings.mark("database")
+    get_replica_set().start()
+    database_health.start()
+    startup_timings.mark("background_tasks")
+    startup_timings.report()
     yield
     logger.info("⛔ Shutting down FastAPI application")
+    security_manager.hasher_pool.shutdown()
+    await database_health.stop()
+    await get_replica_set().stop()
+    await logger.complete()
 
 
 def create_application() -> FastAPI:
@@ -56,6 +86,10 @@ def create_application() -> FastAPI:
     app.add_exception_handler(IntegrityError, integrity_error_handler)
     app.add_exception_handler(Exception, generic_exception_handler)
 
+    # Innermost, so shed requests still get CORS headers and are measured
+    if _settings.ADMISSION_ENABLED:
+        app.add_middleware(AdmissionMiddleware, controller=admission_controller)
+
     if _settings.BACKEND_CORS_ORIGINS:
         app.add_middleware(
             CORSMiddleware,
@@ -65,9 +99,31 @@ def create_application() -> FastAPI:
             allow_headers=["*"],
         )
 
+    if _settings.COMPRESSION_ENABLED:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=_settings.COMPRESSION_MINIMUM_SIZE,
+            level=_settings.COMPRESSION_LEVEL,
+            levels=_settings.COMPRESSION_LEVELS,
+        )
+
+    if _settings.QUERY_PROFILER_ENABLED:
+        app.add_middleware(
+            QueryProfilerMiddleware,
+            max_queries=_settings.QUERY_PROFILER_MAX_QUERIES,
+            max_duration_ms=_settings.QUERY_PROFILER_MAX_DURATION_MS,
+            repeat_threshold=_settings.QUERY_PROFILER_REPEAT_THRESHOLD,
+        )
+
+    # Added last so it wraps everything, including CORS preflights
+    if _settings.METRICS_ENABLED:
+        app.add_middleware(MetricsMiddleware)
+
     app.include_router(api_router)
 
     return app
 
 
 app = create_application()
+
+startup_timings.mark("create_app")
@@ -0,0 +1,268 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+
+from fastapi import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import get_setting
+from app.core.exceptions import (
+    AppError,
+    RateLimitExceededError,
+    ServiceUnavailableError,
+)
+from app.core.metrics import registry
+from app.exceptions.handlers import app_exception_handler
+
+_settings = get_setting()
+
+ADMISSION_DECISIONS = registry.counter(
+    "admission_decisions_total",
+    "Requests admitted or shed by admission control",
+    ("limiter", "outcome"),
+)
+
+
+class ConcurrencyLimiter:
+    """Semaphore with a bounded FIFO wait queue and a wait deadline.
+
+    Freed slots are handed directly to the oldest waiter, so a request
+    arriving while others wait cannot jump the queue.
+    """
+
+    def __init__(self, name: str, limit: int, max_queue: int, timeout: float):
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.active = 0
+        self._waiters: deque[asyncio.Future] = deque()
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    @property
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self.timeout))
+
+    async def acquire(self) -> None:
+        """Take a slot, raising ``ServiceUnavailableError`` when shed"""
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            ADMISSION_DECISIONS.inc(self.name, "admitted")
+            return
+
+        if len(self._waiters) >= self.max_queue:
+            ADMISSION_DECISIONS.inc(self.name, "queue_full")
+            raise ServiceUnavailableError(retry_after=self.retry_after)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.timeout)
+        except BaseException as e:
+            # Handed a slot just as the wait timed out or was cancelled, which
+            # wait_for reports on Python 3.12+: pass it on
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            if not isinstance(e, TimeoutError):
+                raise
+            ADMISSION_DECISIONS.inc(self.name, "timeout")
+            raise ServiceUnavailableError(retry_after=self.retry_after) from None
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+
+        ADMISSION_DECISIONS.inc(self.name, "queued")
+
+    def release(self) -> None:
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                # The slot moves to the waiter, ``active`` is unchanged
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    def stats(self) -> dict[str, int | float]:
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "waiting": self.waiting,
+            "max_queue": self.max_queue,
+            "queue_timeout": self.timeout,
+        }
+
+
+class _TokenBucket:
+    __slots__ = ("tokens", "updated")
+
+    def __init__(self, tokens: float, updated: float):
+        self.tokens = tokens
+        self.updated = updated
+
+
+class ClientRateLimiter:
+    """Token bucket per client address, the least recent clients are
+    forgotten beyond ``max_clients``"""
+
+    def __init__(self, rate: float, burst: int, max_clients: int = 100_000):
+        self.rate = rate
+        self.burst = burst
+        self.max_clients = max_clients
+        self._buckets: OrderedDict[str, _TokenBucket] = OrderedDict()
+
+    def allow(self, client: str) -> bool:
+        now = time.monotonic()
+        bucket = self._buckets.get(client)
+        if bucket is None:
+            bucket = self._buckets[client] = _TokenBucket(self.burst, now)
+            if len(self._buckets) > self.max_clients:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(client)
+            bucket.tokens = min(
+                self.burst, bucket.tokens + (now - bucket.updated) * self.rate
+            )
+            bucket.updated = now
+
+        if bucket.tokens < 1:
+            return False
+        bucket.tokens -= 1
+        return True
+
+    @property
+    def retry_after(self) -> int:
+        return max(1, math.ceil(1 / self.rate))
+
+
+class AdmissionController:
+    """Admission decisions shared by the middleware and the stats endpoint"""
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_queue: int,
+        queue_timeout: float,
+        route_limits: dict[str, int] | None = None,
+        exempt_paths: list[str] | None = None,
+        rate_limiter: ClientRateLimiter | None = None,
+    ):
+        self.limiter = ConcurrencyLimiter(
+            "global", max_concurrency, max_queue, queue_timeout
+        )
+        # Longest prefix first so the most specific limit wins
+        self.route_limiters = [
+            ConcurrencyLimiter(prefix, limit, max_queue, queue_timeout)
+            for prefix, limit in sorted(
+                (route_limits or {}).items(), key=lambda item: -len(item[0])
+            )
+        ]
+        self.exempt_paths = tuple(exempt_paths or ())
+        self.rate_limiter = rate_limiter
+
+    def route_limiter(self, path: str) -> ConcurrencyLimiter | None:
+        for limiter in self.route_limiters:
+            if path.startswith(limiter.name):
+                return limiter
+        return None
+
+    def stats(self) -> dict:
+        return {
+            "global": self.limiter.stats(),
+            "routes": {
+                limiter.name: limiter.stats() for limiter in self.route_limiters
+            },
+            "rate_limited_clients": len(self.rate_limiter._buckets)
+            if self.rate_limiter
+            else None,
+        }
+
+
+class AdmissionMiddleware:
+    """Shed load before it reaches the database pool.
+
+    Requests beyond the concurrency limit wait in a bounded queue for at
+    most ``queue_timeout`` seconds; when the queue is full or the wait
+    expires they get an immediate 503 with ``Retry-After`` instead of
+    timing out inside the pool. Clients over their rate get a 429.
+    """
+
+    def __init__(self, app: ASGIApp, controller: "AdmissionController"):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        controller = self.controller
+        if scope["type"] != "http" or scope["path"].startswith(controller.exempt_paths):
+            await self.app(scope, receive, send)
+            return
+
+        limiters = []
+        try:
+            if controller.rate_limiter is not None:
+                client = scope["client"][0] if scope.get("client") else ""
+                if not controller.rate_limiter.allow(client):
+                    ADMISSION_DECISIONS.inc("rate_limit", "rejected")
+                    raise RateLimitExceededError(controller.rate_limiter.retry_after)
+
+            route_limiter = controller.route_limiter(scope["path"])
+            if route_limiter is not None:
+                await route_limiter.acquire()
+                limiters.append(route_limiter)
+            await controller.limiter.acquire()
+            limiters.append(controller.limiter)
+        except AppError as exc:
+            for limiter in limiters:
+                limiter.release()
+            response = await app_exception_handler(Request(scope), exc)
+            await response(scope, receive, send)
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            for limiter in limiters:
+                limiter.release()
+
+
+admission_controller = AdmissionController(
+    max_concurrency=_settings.ADMISSION_MAX_CONCURRENCY
+    or _settings.DB_POOL_SIZE + _settings.DB_MAX_OVERFLOW,
+    max_queue=_settings.ADMISSION_MAX_QUEUE,
+    queue_timeout=_settings.ADMISSION_QUEUE_TIMEOUT,
+    route_limits=_settings.ADMISSION_ROUTE_LIMITS,
+    exempt_paths=_settings.ADMISSION_EXEMPT_PATHS,
+    rate_limiter=ClientRateLimiter(
+        _settings.RATE_LIMIT_PER_SECOND, _settings.RATE_LIMIT_BURST
+    )
+    if _settings.RATE_LIMIT_ENABLED
+    else None,
+)
+
+registry.gauge(
+    "admission_active_requests",
+    "Requests holding an admission slot",
+    ("limiter",),
+    callback=lambda: [
+        ((limiter.name,), limiter.active)
+        for limiter in (
+            admission_controller.limiter,
+            *admission_controller.route_limiters,
+        )
+    ],
+)
+registry.gauge(
+    "admission_waiting_requests",
+    "Requests queued for an admission slot",
+    ("limiter",),
+    callback=lambda: [
+        ((limiter.name,), limiter.waiting)
+        for limiter in (
+            admission_controller.limiter,
+            *admission_controller.route_limiters,
+        )
+    ],
+)
@@ -0,0 +1,271 @@
+import zlib
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Optional codecs, offered only when their package is installed
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+# Content types worth compressing, matched on the type without parameters
+_COMPRESSIBLE_PREFIXES = ("text/",)
+_COMPRESSIBLE_TYPES = {
+    "application/json",
+    "application/x-ndjson",
+    "application/jsonl",
+    "application/ndjson",
+    "application/problem+json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+}
+# Events must reach the client as they are sent, never held for a threshold
+_NEVER_COMPRESS = {"text/event-stream"}
+
+
+class _Encoder(ABC):
+    """Incremental compressor of one response body"""
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        """Feed ``data``, returning whatever output is ready"""
+
+    @abstractmethod
+    def flush(self) -> bytes:
+        """Output everything fed so far, the stream stays open"""
+
+    @abstractmethod
+    def finish(self) -> bytes:
+        """Output the rest and end the stream"""
+
+
+class _ZlibEncoder(_Encoder):
+    def __init__(self, level: int, wbits: int):
+        self._compressor = zlib.compressobj(max(1, min(level, 9)), zlib.DEFLATED, wbits)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliEncoder(_Encoder):
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=max(0, min(level, 11)))
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdEncoder(_Encoder):
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(
+            level=max(1, min(level, 22))
+        ).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH)
+
+
+def _available_encoders() -> dict[str, Callable[[int], _Encoder]]:
+    """Encoders by content-coding, in order of preference"""
+    encoders: dict[str, Callable[[int], _Encoder]] = {}
+    if zstandard is not None:
+        encoders["zstd"] = _ZstdEncoder
+    if brotli is not None:
+        encoders["br"] = _BrotliEncoder
+    encoders["gzip"] = lambda level: _ZlibEncoder(level, 16 + zlib.MAX_WBITS)
+    encoders["deflate"] = lambda level: _ZlibEncoder(level, zlib.MAX_WBITS)
+    return encoders
+
+
+def negotiate_encoding(accept_encoding: str, available: list[str]) -> str | None:
+    """Preferred available coding the client accepts, by q-value then by
+    ``available`` order; ``None`` when identity should be sent"""
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[coding] = q
+
+    default = weights.get("*", 0.0)
+    best, best_q = None, 0.0
+    for coding in available:
+        q = weights.get(coding, default)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+class CompressionMiddleware:
+    """Compress responses with the best coding the client accepts.
+
+    Bodies smaller than ``minimum_size`` are sent as they are. Streamed
+    bodies are compressed chunk by chunk and flushed after every chunk, so
+    the client receives data as soon as it is produced. Responses that
+    already have a ``Content-Encoding``, or whose type is not text-like,
+    pass through untouched. ``levels`` overrides ``level`` per content
+    type; the level is clamped to each codec's range.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        level: int = 6,
+        levels: dict[str, int] | None = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.level = level
+        self.levels = levels or {}
+        self.encoders = _available_encoders()
+        self._codings = list(self.encoders)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        coding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding", ""), self._codings
+        )
+        if coding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await _CompressedResponse(self, coding, send).run(scope, receive)
+
+
+class _CompressedResponse:
+    """State of one response going through ``CompressionMiddleware``"""
+
+    def __init__(self, middleware: CompressionMiddleware, coding: str, send: Send):
+        self.middleware = middleware
+        self.coding = coding
+        self.send = send
+        self.start: Message | None = None
+        self.buffer: list[bytes] = []
+        self.buffered = 0
+        self.encoder: _Encoder | None = None
+        self.passthrough = False
+
+    async def run(self, scope: Scope, receive: Receive) -> None:
+        await self.middleware.app(scope, receive, self.send_wrapper)
+
+    def _content_type(self, headers: Headers) -> str:
+        return headers.get("content-type", "").split(";", 1)[0].strip().lower()
+
+    def _should_compress(self, message: Message) -> bool:
+        headers = Headers(raw=message["headers"])
+        if message["status"] < 200 or message["status"] in (204, 304):
+            return False
+        if "content-encoding" in headers:
+            return False
+        content_type = self._content_type(headers)
+        if content_type in _NEVER_COMPRESS:
+            return False
+        return content_type in _COMPRESSIBLE_TYPES or content_type.startswith(
+            _COMPRESSIBLE_PREFIXES
+        )
+
+    async def send_wrapper(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            if self._should_compress(message):
+                self.start = message
+            else:
+                self.passthrough = True
+                await self.send(message)
+            return
+
+        if self.passthrough or message["type"] != "http.response.body":
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.encoder is not None:
+            chunk = self.encoder.compress(body)
+            chunk += self.encoder.flush() if more_body else self.encoder.finish()
+            await self.send(
+                {"type": "http.response.body", "body": chunk, "more_body": more_body}
+            )
+            return
+
+        # Hold the first chunks until the threshold tells whether to compress
+        self.buffer.append(body)
+        self.buffered += len(body)
+        if self.buffered < self.middleware.minimum_size:
+            if more_body:
+                return
+            await self._send_identity()
+            return
+
+        await self._start_encoding(more_body)
+
+    async def _send_identity(self) -> None:
+        headers = MutableHeaders(scope=self.start)
+        headers.add_vary_header("Accept-Encoding")
+        await self.send(self.start)
+        await self.send({"type": "http.response.body", "body": b"".join(self.buffer)})
+
+    async def _start_encoding(self, more_body: bool) -> None:
+        headers = MutableHeaders(scope=self.start)
+        content_type = self._content_type(headers)
+        level = self.middleware.levels.get(content_type, self.middleware.level)
+        self.encoder = self.middleware.encoders[self.coding](level)
+
+        body = self.encoder.compress(b"".join(self.buffer))
+        body += self.encoder.flush() if more_body else self.encoder.finish()
+        self.buffer = []
+
+        headers["Content-Encoding"] = self.coding
+        headers.add_vary_header("Accept-Encoding")
+        # The encoded representation differs, a strong validator must not match
+        etag = headers.get("etag")
+        if etag is not None and not etag.startswith("W/"):
+            headers["ETag"] = f"W/{etag}"
+        if more_body:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(len(body))
+
+        await self.send(self.start)
+        await self.send(
+            {"type": "http.response.body", "body": body, "more_body": more_body}
+        )
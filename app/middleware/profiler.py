@@ -0,0 +1,72 @@
+import time
+
+from loguru import logger
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.db.profiling import QueryProfile, profile_queries
+
+
+class QueryProfilerMiddleware:
+    """Count the SQL statements of every request.
+
+    Adds ``X-Query-Count`` and ``Server-Timing`` headers and logs a warning
+    when a request runs too many queries, spends too long in the database,
+    or repeats one statement shape (the usual sign of an N+1 pattern).
+    Headers reflect the queries run before the response started, the
+    warning covers the whole request, streamed body included.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_queries: int = 20,
+        max_duration_ms: float = 200.0,
+        repeat_threshold: int = 5,
+    ):
+        self.app = app
+        self.max_queries = max_queries
+        self.max_duration = max_duration_ms / 1000
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                elapsed = time.perf_counter() - start
+                headers = MutableHeaders(scope=message)
+                headers.append("X-Query-Count", str(profile.count))
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={profile.duration * 1000:.2f};desc="{profile.count} '
+                    f'queries", app;dur={elapsed * 1000:.2f}',
+                )
+            await send(message)
+
+        with profile_queries() as profile:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                self._check(scope, profile)
+
+    def _check(self, scope: Scope, profile: QueryProfile) -> None:
+        problems = []
+        if profile.count > self.max_queries:
+            problems.append(f"{profile.count} queries")
+        if profile.duration > self.max_duration:
+            problems.append(f"{profile.duration * 1000:.1f}ms in the database")
+        problems.extend(
+            f"{count}x {shape[:200]}"
+            for shape, count in profile.repeated(self.repeat_threshold)
+        )
+
+        if problems:
+            logger.warning(
+                f"Query profile of {scope['method']} {scope['path']}: "
+                + "; ".join(problems)
+            )
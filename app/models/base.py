@@ -17,6 +17,9 @@ class UUIDMixin:
 class TimestampMixin:
     """Mixin for created_at and updated_at timestamps"""
 
+    # Fetch server generated timestamps with RETURNING during the flush
+    __mapper_args__ = {"eager_defaults": True}
+
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, String
+from sqlalchemy import DDL, Boolean, Index, String, event, func
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.db.base import Base
@@ -9,9 +9,41 @@ class User(Base, UUIDMixin, TimestampMixin):
     """User database model"""
 
     __tablename__ = "users"
-
-    email: Mapped[String] = mapped_column(
-        String, unique=True, index=True, nullable=False
+    __table_args__ = (
+        # Backs keyset pagination on (created_at, id)
+        Index("ix_users_created_at_id", "created_at", "id"),
+        # Lists in updated_at order, and max(updated_at) for list page ETags
+        Index("ix_users_updated_at_id", "updated_at", "id"),
+        # Lists filtered on is_active, by created_at range and order
+        Index("ix_users_is_active_created_at_id", "is_active", "created_at", "id"),
+        # Lists filtered on is_active in updated_at order
+        Index("ix_users_is_active_updated_at_id", "is_active", "updated_at", "id"),
     )
+
+    # Unique regardless of case through ix_users_email_lower, emails are
+    # stored lowercased
+    email: Mapped[String] = mapped_column(String, nullable=False)
     hashed_password: Mapped[String] = mapped_column(String, nullable=False)
     is_active: Mapped[Boolean] = mapped_column(Boolean, default=True)
+
+
+# Equality lookups, ON CONFLICT and prefix (LIKE 'abc%') searches
+Index(
+    "ix_users_email_lower",
+    func.lower(User.email).label("email_lower"),
+    unique=True,
+    postgresql_ops={"email_lower": "text_pattern_ops"},
+)
+# Substring (LIKE '%abc%') searches
+Index(
+    "ix_users_email_trgm",
+    func.lower(User.email).label("email_trgm"),
+    postgresql_using="gin",
+    postgresql_ops={"email_trgm": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+
+event.listen(
+    User.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
@@ -1,80 +1,573 @@
+import json
 import uuid
-from typing import Generic, TypeVar
+from collections.abc import AsyncIterator, Mapping, Sequence
+from typing import Any, Generic, TypeVar
 
-from sqlalchemy import func, select
+from sqlalchemy import (
+    ColumnElement,
+    delete,
+    func,
+    insert,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.sql.base import Executable, Generative
+from sqlalchemy.sql.expression import ClauseElement
 
+from app.core.config import get_setting
 from app.db.base import Base
+from app.db.session import READ_REPLICA, session_has_writes
+from app.db.unit_of_work import UnitOfWork
+from app.repositories.cache import CacheBackend, entity_cache
+from app.repositories.filters import FilterField, filter_criteria, sort_order
+from app.repositories.pagination import (
+    CountCache,
+    CountStrategy,
+    CursorPage,
+    OffsetPage,
+    decode_cursor,
+    encode_cursor,
+)
+from app.repositories.singleflight import SingleFlight, repository_flight
 from app.schemas.base import BaseModel
 
 ModelType = TypeVar("ModelType", bound=Base)
 
+_settings = get_setting()
+
+
+class _Explain(Generative, Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON)`` of a statement, bound like the statement"""
+
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
 
 class BaseRepository(Generic[ModelType]):
     """
     Base repository with common CRUD operations
     """
 
-    def __init__(self, model: type[ModelType], db: AsyncSession):
+    count_cache = CountCache(ttl=_settings.PAGINATION_COUNT_CACHE_TTL)
+
+    # Unique columns whose lookups go through the entity cache
+    cached_fields: tuple[str, ...] = ("id",)
+
+    # Filters and sort keys accepted from untrusted input, each one must be
+    # backed by an index
+    filter_fields: dict[str, FilterField] = {}
+    sort_fields: dict[str, tuple[str, ...]] = {}
+
+    def __init__(
+        self,
+        model: type[ModelType],
+        db: AsyncSession,
+        cache: CacheBackend | None = None,
+        flight: SingleFlight | None = None,
+    ):
         self.model = model
         self.db = db
+        self.cache = cache if cache is not None else entity_cache
+        self.flight = flight if flight is not None else repository_flight
 
     async def get_by_id(self, id: uuid.UUID) -> ModelType | None:
         """Get a single record by ID"""
-        result = await self.db.execute(select(self.model).filter(self.model.id == id))
+        return await self._get_one_by("id", id)
+
+    async def _get_one_by(self, field: str, value: Any) -> ModelType | None:
+        """Get a single record by a unique column, reading through the cache
+
+        A cache hit is merged into the session without emitting SQL, so it
+        never checks out a pool connection. On a miss, concurrent lookups of
+        the same value share one query; each caller gets its own copy of the
+        row merged into its own session.
+
+        A session with pending or flushed writes bypasses both: it must see
+        its own changes, and the rows it reads may not be committed yet.
+        """
+        use_cache = self.cache is not None and field in self.cached_fields
+        shared = self.flight is not None
+        if not self._session_is_clean():
+            use_cache = shared = False
+
+        if not (use_cache or shared):
+            return await self._fetch_one_by(field, value)
+
+        key = self._cache_key(field, value)
+        if use_cache:
+            snapshot = await self.cache.get(key)
+            if snapshot is not None:
+                return await self._from_snapshot(snapshot)
+
+        async def fetch() -> dict[str, Any] | None:
+            db_obj = await self._fetch_one_by(field, value)
+            if db_obj is None:
+                return None
+
+            snapshot = self._snapshot(db_obj)
+            if use_cache:
+                await self.cache.set(key, snapshot)
+            return snapshot
+
+        snapshot = await self.flight.do(key, fetch) if shared else await fetch()
+        return await self._from_snapshot(snapshot) if snapshot is not None else None
+
+    async def _fetch_one_by(self, field: str, value: Any) -> ModelType | None:
+        result = await self.db.execute(
+            self._on_replica(
+                select(self.model).filter(self._lookup_column(field) == value)
+            )
+        )
         return result.scalar_one_or_none()
 
+    def filter_criteria(self, filters: Mapping[str, Any]) -> list[ColumnElement[bool]]:
+        """Criteria for filters from untrusted input, see ``filter_fields``"""
+        return filter_criteria(self.model, self.filter_fields, filters)
+
+    def sort_order(
+        self, sort: str | None, filters: Mapping[str, Any] | None = None
+    ) -> list[ColumnElement]:
+        """ORDER BY for a sort from untrusted input, see ``sort_fields``"""
+        return sort_order(self.model, self.sort_fields, sort, filters)
+
+    def _lookup_column(self, field: str) -> ColumnElement:
+        """Expression a lookup by ``field`` compares the value with"""
+        return getattr(self.model, field)
+
+    @staticmethod
+    def _on_replica(query):
+        """Allow ``query`` to run on a read replica when one is configured"""
+        return query.execution_options(**{READ_REPLICA: True})
+
+    def _session_is_clean(self) -> bool:
+        """Whether the session has no unflushed or uncommitted writes"""
+        return not (
+            self.db.new
+            or self.db.dirty
+            or self.db.deleted
+            or session_has_writes(self.db)
+        )
+
+    def _cache_key(self, field: str, value: Any) -> str:
+        return f"{self.model.__tablename__}:{field}:{value}"
+
+    def _cache_keys(self, db_obj: ModelType) -> list[str]:
+        return [
+            self._cache_key(field, getattr(db_obj, field))
+            for field in self.cached_fields
+        ]
+
+    def _snapshot(self, db_obj: ModelType) -> dict[str, Any]:
+        """Column values of ``db_obj``, detached from any session"""
+        return {
+            attr.key: getattr(db_obj, attr.key)
+            for attr in self.model.__mapper__.column_attrs
+        }
+
+    async def _from_snapshot(self, snapshot: dict[str, Any]) -> ModelType:
+        db_obj = self.model(**snapshot)
+        make_transient_to_detached(db_obj)
+        return await self.db.merge(db_obj, load=False)
+
     async def get_all(
-        self, skip: int = 0, limit: int = 100
-    ) -> tuple[int, list[ModelType]]:
-        """Get all records with pagination"""
-        count_query = select(func.count()).select_from(self.model)
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar_one()
-
-        result = await self.db.execute(select(self.model).offset(skip).limit(limit))
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+        criteria: Sequence[ColumnElement[bool]] = (),
+        order_by: Sequence[ColumnElement] = (),
+    ) -> OffsetPage[ModelType]:
+        """Get all records matching ``criteria`` with pagination
+
+        One extra row is always fetched so ``has_next`` is accurate whatever
+        the count strategy is. A list filtered by ``criteria`` is counted
+        exactly with ``exact`` and ``window`` only; ``cached`` and
+        ``estimated`` take the planner's estimate of the filtered query, or
+        leave the total out when there is none.
+        """
+        query = self._on_replica(
+            select(self.model)
+            .filter(*criteria)
+            .order_by(*order_by)
+            .offset(skip)
+            .limit(limit + 1)
+        )
+
+        if count_strategy == CountStrategy.WINDOW:
+            result = await self.db.execute(
+                query.add_columns(func.count().over().label("total"))
+            )
+            rows = result.all()
+            items = [row[0] for row in rows]
+            if rows:
+                total = rows[0].total
+            elif skip == 0:
+                total = 0
+            else:
+                # Past the last row the window has nothing to count over
+                total = await self._count(*criteria)
+            total_exact = True
+        else:
+            result = await self.db.execute(query)
+            items = list(result.scalars().all())
+            total, total_exact = await self._resolve_total(count_strategy, criteria)
+
+        return OffsetPage(
+            items=items[:limit],
+            total=total,
+            total_exact=total_exact,
+            has_next=len(items) > limit,
+        )
+
+    async def stream_all(self, fetch_size: int = 1000) -> AsyncIterator[ModelType]:
+        """Iterate over every record through a server-side cursor
+
+        Only ``fetch_size`` rows are buffered at a time, so memory does not
+        depend on the table size. Closing the iterator closes the cursor.
+        """
+        query = self._on_replica(
+            select(self.model)
+            .order_by(self.model.created_at, self.model.id)
+            .execution_options(yield_per=fetch_size)
+        )
+        result = await self.db.stream_scalars(query)
+        try:
+            async for item in result:
+                yield item
+        finally:
+            await result.close()
+
+    async def _count(self, *criteria: ColumnElement[bool]) -> int:
+        """Exact number of rows in the table, or of those matching ``criteria``"""
+        result = await self.db.execute(
+            self._on_replica(
+                select(func.count()).select_from(self.model).filter(*criteria)
+            )
+        )
+        return result.scalar_one()
+
+    async def get_version(self) -> tuple[Any, int]:
+        """Latest ``updated_at`` and row count of the table
+
+        Inserts, updates and deletes all change the pair, so it validates
+        cached list pages without loading them.
+        """
+        result = await self.db.execute(
+            self._on_replica(
+                select(func.max(self.model.updated_at), func.count()).select_from(
+                    self.model
+                )
+            )
+        )
+        latest, total = result.one()
+        return latest, total
+
+    async def _estimate_count(
+        self, criteria: Sequence[ColumnElement[bool]] = ()
+    ) -> int | None:
+        """Planner row estimate, ``None`` when it is not available
+
+        The table's is read from ``pg_class``, that of rows matching
+        ``criteria`` from the plan of the filtered query.
+        """
+        if self.db.get_bind().dialect.name != "postgresql":
+            return None
+
+        if criteria:
+            result = await self.db.execute(
+                self._on_replica(_Explain(select(self.model.id).filter(*criteria)))
+            )
+            plan = result.scalar_one()
+            # Drivers without a json codec return the plan as text
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]["Plan"]["Plan Rows"])
+
+        result = await self.db.execute(
+            self._on_replica(
+                text(
+                    "SELECT reltuples::bigint FROM pg_class "
+                    "WHERE oid = CAST(:table AS regclass)"
+                )
+            ),
+            {"table": self.model.__tablename__},
+        )
+        estimate = result.scalar_one_or_none()
+        # reltuples is -1 until the table has been vacuumed or analyzed
+        return estimate if estimate is not None and estimate >= 0 else None
+
+    async def _resolve_total(
+        self,
+        count_strategy: CountStrategy,
+        criteria: Sequence[ColumnElement[bool]] = (),
+    ) -> tuple[int | None, bool]:
+        """Total rows and whether the value is exact for ``count_strategy``"""
+        if count_strategy == CountStrategy.NONE:
+            return None, False
+
+        if criteria and count_strategy != CountStrategy.EXACT:
+            # The count cache only holds whole tables
+            return await self._estimate_count(criteria), False
+
+        if count_strategy == CountStrategy.ESTIMATED:
+            estimate = await self._estimate_count()
+            if estimate is not None:
+                return estimate, False
+
+        if count_strategy == CountStrategy.CACHED:
+            cached = self.count_cache.get(self.model.__tablename__)
+            if cached is not None:
+                return cached, False
+
+            total = await self._count()
+            self.count_cache.set(self.model.__tablename__, total)
+            return total, True
+
+        return await self._count(*criteria), True
+
+    async def invalidate(self, *db_objs: ModelType, keys: Sequence[str] = ()) -> None:
+        """Drop cached data derived from this table after a write
+
+        Args:
+            *db_objs (ModelType): Written records whose cache entries are stale
+            keys (Sequence[str], optional): Extra cache keys to drop, such as
+                the keys of values overwritten by an update.
+        """
+        self.count_cache.invalidate(self.model.__tablename__)
+
+        if self.cache is not None:
+            stale = [key for db_obj in db_objs for key in self._cache_keys(db_obj)]
+            stale.extend(keys)
+            if stale:
+                await self.cache.delete(*stale)
+
+    async def get_page_by_cursor(
+        self,
+        cursor: str | None = None,
+        limit: int = 100,
+        criteria: Sequence[ColumnElement[bool]] = (),
+    ) -> CursorPage[ModelType]:
+        """Get records matching ``criteria`` with keyset pagination on
+        ``(created_at, id)``
+
+        Unlike ``get_all`` the cost does not grow with the page depth, the
+        boundary row is located through the composite index.
+        """
+        keyset = tuple_(self.model.created_at, self.model.id)
+        query = select(self.model).filter(*criteria)
+        backward = False
+
+        if cursor:
+            created_at, id, backward = decode_cursor(cursor)
+            position = tuple_(created_at, id)
+            query = query.filter(keyset < position if backward else keyset > position)
+
+        if backward:
+            query = query.order_by(self.model.created_at.desc(), self.model.id.desc())
+        else:
+            query = query.order_by(self.model.created_at, self.model.id)
+
+        result = await self.db.execute(self._on_replica(query.limit(limit + 1)))
         items = list(result.scalars().all())
 
-        return total, items
+        has_more = len(items) > limit
+        items = items[:limit]
+        if backward:
+            items.reverse()
+
+        if not items:
+            return CursorPage(items=items)
+
+        first, last = items[0], items[-1]
+        has_next = has_more if not backward else True
+        has_prev = has_more if backward else cursor is not None
+
+        return CursorPage(
+            items=items,
+            next_cursor=encode_cursor(last.created_at, last.id) if has_next else None,
+            prev_cursor=encode_cursor(first.created_at, first.id, backward=True)
+            if has_prev
+            else None,
+        )
+
+    async def _commit(self, *db_objs: ModelType, keys: Sequence[str] = ()) -> None:
+        """Make a write durable and drop the cache entries it made stale
+
+        Inside a unit of work the write is only flushed, the commit and the
+        cache invalidation happen once the request's work is committed.
+        """
+        unit_of_work = UnitOfWork.of(self.db)
+        if unit_of_work is None:
+            await self.db.commit()
+            await self.invalidate(*db_objs, keys=keys)
+            return
+
+        await self.db.flush()
+        unit_of_work.on_commit(lambda: self.invalidate(*db_objs, keys=keys))
 
     async def create(self, obj_in: BaseModel) -> ModelType:
-        """Create a new record"""
+        """Create a new record with a single ``INSERT ... RETURNING``
 
-        obj_data = obj_in.model_dump(exclude_unset=True)
-        db_obj = self.model(**obj_data)
-        self.db.add(db_obj)
-        await self.db.commit()
-        await self.db.refresh(db_obj)
+        Server defaults come back in the same statement, no refresh needed.
+        """
+        stmt = (
+            insert(self.model)
+            .values(**obj_in.model_dump(exclude_unset=True))
+            .returning(self.model)
+        )
+        db_obj = (await self.db.scalars(stmt)).one()
+        await self._commit(db_obj)
 
         return db_obj
 
+    async def create_if_absent(
+        self,
+        obj_in: BaseModel | dict,
+        conflict_fields: Sequence[str | ColumnElement],
+    ) -> ModelType | None:
+        """Create a record unless it conflicts on ``conflict_fields``
+
+        A single ``INSERT ... ON CONFLICT DO NOTHING RETURNING``, so there is
+        no window between checking for a duplicate and inserting.
+
+        Returns:
+            ModelType | None: The new record, ``None`` if it already existed
+        """
+        created = await self.create_many([obj_in], conflict_fields=conflict_fields)
+        return created[0] if created else None
+
+    async def create_many(
+        self,
+        objs_in: Sequence[BaseModel | dict],
+        conflict_fields: Sequence[str | ColumnElement] | None = None,
+    ) -> list[ModelType]:
+        """Create many records with one multi-row INSERT
+
+        Rows conflicting on ``conflict_fields``, column names or the
+        expressions of a unique index (any unique constraint when not
+        given), are skipped with ``ON CONFLICT DO NOTHING``, so only the
+        records actually inserted are returned.
+        """
+        if not objs_in:
+            return []
+
+        rows = [
+            obj if isinstance(obj, dict) else obj.model_dump(exclude_unset=True)
+            for obj in objs_in
+        ]
+        stmt = (
+            postgresql.insert(self.model)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=conflict_fields)
+            .returning(self.model)
+        )
+
+        result = await self.db.scalars(stmt)
+        created = list(result.all())
+        await self._commit(*created)
+
+        return created
+
     async def update(self, id: uuid.UUID, obj_in: BaseModel | dict) -> ModelType | None:
-        """Update an existing record"""
-        db_obj = await self.get_by_id(id)
+        """Update an existing record with a single ``UPDATE ... RETURNING``"""
+        values = self._column_values(obj_in)
+        if not values:
+            return await self.get_by_id(id)
 
-        if not db_obj:
-            return None
+        rows = await self._update_returning([self.model.id == id], values)
+        return rows[0] if rows else None
+
+    async def update_where(
+        self, *criteria: ColumnElement[bool], values: BaseModel | dict
+    ) -> list[ModelType]:
+        """Update every record matching ``criteria`` and return them"""
+        if not criteria:
+            raise ValueError("update_where requires at least one criterion")
+
+        column_values = self._column_values(values)
+        if not column_values:
+            return []
+
+        return await self._update_returning(list(criteria), column_values)
+
+    async def delete(self, id: uuid.UUID) -> bool:
+        """Delete a record by ID with a single ``DELETE ... RETURNING``"""
+        return bool(await self._delete_returning([self.model.id == id]))
+
+    async def delete_where(self, *criteria: ColumnElement[bool]) -> list[ModelType]:
+        """Delete every record matching ``criteria`` and return them"""
+        if not criteria:
+            raise ValueError("delete_where requires at least one criterion")
+
+        return await self._delete_returning(list(criteria))
 
-        update_data = (
+    def _column_values(self, obj_in: BaseModel | dict) -> dict[str, Any]:
+        """Keep the values that map to columns of the model"""
+        data = (
             obj_in
             if isinstance(obj_in, dict)
             else obj_in.model_dump(exclude_unset=True)
         )
+        columns = self.model.__mapper__.column_attrs.keys()
+        return {key: value for key, value in data.items() if key in columns}
 
-        for key, value in update_data.items():
-            if hasattr(db_obj, key):
-                setattr(db_obj, key, value)
+    async def _update_returning(
+        self, criteria: list[ColumnElement[bool]], values: dict[str, Any]
+    ) -> list[ModelType]:
+        stale_keys = await self._overwritten_cache_keys(criteria, values)
+        stmt = (
+            update(self.model)
+            .where(*criteria)
+            .values(**values)
+            .returning(self.model)
+            .execution_options(populate_existing=True)
+        )
 
-        await self.db.commit()
-        await self.db.refresh(db_obj)
-        return db_obj
+        rows = list((await self.db.scalars(stmt)).all())
+        await self._commit(*rows, keys=stale_keys)
 
-    async def delete(self, id: uuid.UUID) -> bool:
-        """Delete a record by ID"""
-        db_obj = await self.get_by_id(id)
-        if db_obj:
-            await self.db.delete(db_obj)
-            await self.db.commit()
-            return True
+        return rows
+
+    async def _delete_returning(
+        self, criteria: list[ColumnElement[bool]]
+    ) -> list[ModelType]:
+        stmt = delete(self.model).where(*criteria).returning(self.model)
+
+        rows = list((await self.db.scalars(stmt)).all())
+        await self._commit(*rows)
+
+        return rows
+
+    async def _overwritten_cache_keys(
+        self, criteria: list[ColumnElement[bool]], values: dict[str, Any]
+    ) -> list[str]:
+        """Cache keys of unique values an update is about to overwrite
+
+        RETURNING only yields the new values, so when a cached column such
+        as an email changes its previous values are read first. This extra
+        query only happens with the entity cache enabled.
+        """
+        fields = [field for field in self.cached_fields if field in values]
+        if self.cache is None or not fields:
+            return []
 
-        return False
+        columns = [getattr(self.model, field) for field in fields]
+        result = await self.db.execute(select(*columns).where(*criteria))
+        return [
+            self._cache_key(field, value)
+            for row in result
+            for field, value in zip(fields, row, strict=True)
+        ]
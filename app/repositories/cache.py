@@ -0,0 +1,89 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any
+
+from app.core.config import get_setting
+
+_settings = get_setting()
+
+
+class CacheBackend(ABC):
+    """Storage used by repositories to cache entity snapshots.
+
+    Methods are async so a shared store (Redis, memcached...) can be
+    plugged in without changing the repositories.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Any | None:
+        """Get a cached value, ``None`` on a miss"""
+
+    @abstractmethod
+    async def set(self, key: str, value: Any) -> None:
+        """Store a value"""
+
+    @abstractmethod
+    async def delete(self, *keys: str) -> None:
+        """Remove values, missing keys are ignored"""
+
+    @abstractmethod
+    def stats(self) -> dict[str, int]:
+        """Counters describing the cache efficiency"""
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process LRU cache with a TTL and a size bound"""
+
+    def __init__(self, max_size: int = 10_000, ttl: float = 60.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    async def get(self, key: str) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    async def set(self, key: str, value: Any) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def delete(self, *keys: str) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+entity_cache: CacheBackend | None = (
+    MemoryCacheBackend(
+        max_size=_settings.ENTITY_CACHE_MAX_SIZE, ttl=_settings.ENTITY_CACHE_TTL
+    )
+    if _settings.ENTITY_CACHE_ENABLED
+    else None
+)
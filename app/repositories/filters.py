@@ -0,0 +1,117 @@
+import operator
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import ColumnElement
+
+from app.core.exceptions import ValidationError
+
+_OPERATORS: dict[str, Callable[[Any, Any], ColumnElement[bool]]] = {
+    "eq": operator.eq,
+    "ne": operator.ne,
+    "gt": operator.gt,
+    "ge": operator.ge,
+    "lt": operator.lt,
+    "le": operator.le,
+    "in": lambda column, value: column.in_(value),
+}
+
+
+@dataclass(frozen=True)
+class FilterField:
+    """A filter a repository accepts from untrusted input
+
+    Compares ``column`` to the value with ``op`` (``eq``, ``ne``, ``gt``,
+    ``ge``, ``lt``, ``le`` or ``in``). Only columns leading an index should
+    be declared, so that no accepted filter makes the database scan.
+    """
+
+    column: str
+    op: str = "eq"
+
+    def __post_init__(self):
+        if self.op not in _OPERATORS:
+            raise ValueError(f"Unknown filter operator {self.op!r}")
+
+
+def filter_criteria(
+    model: type, fields: Mapping[str, FilterField], filters: Mapping[str, Any]
+) -> list[ColumnElement[bool]]:
+    """Criteria for ``filters``, named after keys of ``fields``
+
+    Args:
+        model (type): Mapped model the columns belong to
+        fields (Mapping[str, FilterField]): Accepted filters by name
+        filters (Mapping[str, Any]): Requested filters, ``None`` values are
+            ignored
+
+    Raises:
+        ValidationError: A filter is not in ``fields``
+
+    Returns:
+        list[ColumnElement[bool]]: One criterion per filter
+    """
+    criteria = []
+    for name, value in filters.items():
+        if value is None:
+            continue
+        field = fields.get(name)
+        if field is None:
+            raise ValidationError(f"Filtering on '{name}' is not supported", field=name)
+        criteria.append(_OPERATORS[field.op](getattr(model, field.column), value))
+    return criteria
+
+
+def sort_order(
+    model: type,
+    fields: Mapping[str, tuple[str, ...]],
+    sort: str | None,
+    filters: Mapping[str, Any] | None = None,
+) -> list:
+    """ORDER BY clauses for a ``sort`` parameter such as ``-created_at``
+
+    ``sort`` is a single key of ``fields``, with an optional leading ``-``
+    for descending order. Each key maps to the filters it can be combined
+    with, those an index leads with ahead of the key, so that no accepted
+    pair makes the database sort. The primary key is appended as a tie
+    breaker in the direction of the key, so pages are stable.
+
+    Args:
+        model (type): Mapped model the columns belong to
+        fields (Mapping[str, tuple[str, ...]]): Columns accepted as sort
+            keys, with the filters accepted alongside each
+        sort (str | None): Requested order
+        filters (Mapping[str, Any] | None, optional): Requested filters,
+            ``None`` values are ignored. Defaults to None.
+
+    Raises:
+        ValidationError: ``sort`` is not a key of ``fields``, or a filter
+            cannot be combined with it
+
+    Returns:
+        list: ORDER BY clauses, empty when ``sort`` is empty
+    """
+    if not sort:
+        return []
+
+    descending = sort.startswith("-")
+    name = sort.removeprefix("-")
+    if name not in fields:
+        raise ValidationError(
+            f"Cannot sort on '{sort}', use one of: {', '.join(fields)},"
+            " prefixed with - for descending order",
+            field="sort",
+        )
+
+    for filter_name, value in (filters or {}).items():
+        if value is not None and filter_name not in fields[name]:
+            raise ValidationError(
+                f"Sorting on '{name}' cannot be combined with '{filter_name}'",
+                field="sort",
+            )
+
+    column = getattr(model, name)
+    if descending:
+        return [column.desc(), model.id.desc()]
+    return [column.asc(), model.id.asc()]
@@ -0,0 +1,122 @@
+import base64
+import json
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import StrEnum
+from typing import Generic, TypeVar
+
+from app.core.exceptions import ValidationError
+
+T = TypeVar("T")
+
+_FORWARD = "n"
+_BACKWARD = "p"
+
+
+class CountStrategy(StrEnum):
+    """How the total of an offset paginated list is obtained
+
+    - ``exact``: separate ``SELECT count(*)`` before the page query
+    - ``window``: exact count folded into the page query with ``count(*) OVER ()``
+    - ``cached``: exact count kept for a TTL, dropped on repository writes
+    - ``estimated``: planner estimate from ``pg_class.reltuples``
+    - ``none``: no total at all, ``has_next`` comes from fetching ``limit + 1``
+    """
+
+    EXACT = "exact"
+    WINDOW = "window"
+    CACHED = "cached"
+    ESTIMATED = "estimated"
+    NONE = "none"
+
+
+@dataclass
+class OffsetPage(Generic[T]):
+    """A page of records fetched by offset pagination"""
+
+    items: list[T] = field(default_factory=list)
+    total: int | None = None
+    total_exact: bool = True
+    has_next: bool = False
+
+
+class CountCache:
+    """In-process TTL cache of table row counts"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: dict[str, tuple[float, int]] = {}
+
+    def get(self, key: str) -> int | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+
+        expires_at, total = entry
+        if expires_at < time.monotonic():
+            self._entries.pop(key, None)
+            return None
+
+        return total
+
+    def set(self, key: str, total: int) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, total)
+
+    def invalidate(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+
+@dataclass
+class CursorPage(Generic[T]):
+    """A page of records fetched by keyset pagination"""
+
+    items: list[T] = field(default_factory=list)
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+
+
+def encode_cursor(created_at: datetime, id: uuid.UUID, backward: bool = False) -> str:
+    """Encode a ``(created_at, id)`` keyset position as an opaque token
+
+    Args:
+        created_at (datetime): Sort key of the boundary row
+        id (uuid.UUID): Tie breaker of the boundary row
+        backward (bool, optional): Whether the cursor walks towards older rows.
+            Defaults to False.
+
+    Returns:
+        str: URL safe cursor
+    """
+    raw = json.dumps(
+        [created_at.isoformat(), str(id), _BACKWARD if backward else _FORWARD],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(raw.encode()).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, uuid.UUID, bool]:
+    """Decode a cursor produced by ``encode_cursor``
+
+    Args:
+        cursor (str): Opaque cursor
+
+    Raises:
+        ValidationError: The cursor is malformed
+
+    Returns:
+        tuple[datetime, uuid.UUID, bool]: created_at, id and backward flag
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, id, direction = json.loads(base64.urlsafe_b64decode(padded))
+        if direction not in (_FORWARD, _BACKWARD):
+            raise ValueError(direction)
+        return (
+            datetime.fromisoformat(created_at),
+            uuid.UUID(id),
+            direction == _BACKWARD,
+        )
+    except (ValueError, TypeError) as e:
+        raise ValidationError("Invalid pagination cursor", field="cursor") from e
@@ -0,0 +1,81 @@
+import asyncio
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+from app.core.config import get_setting
+
+_settings = get_setting()
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Coalesce concurrent calls that share a key into one execution.
+
+    The first caller for a key runs the function, callers arriving while it
+    is in flight await the same result. If the running call is cancelled the
+    waiters retry instead of inheriting the cancellation.
+    """
+
+    def __init__(self):
+        self._calls: dict[str, asyncio.Future[Any]] = {}
+        self.executed = 0
+        self.shared = 0
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        """Run ``func`` unless a call for ``key`` is already in flight
+
+        Args:
+            key (str): Identity of the call, equal keys must mean equal results
+            func (Callable[[], Awaitable[T]]): Call to run when leading
+
+        Returns:
+            T: Result of the shared call
+        """
+        while (future := self._calls.get(key)) is not None:
+            try:
+                result = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                if not future.cancelled() or (task and task.cancelling()):
+                    raise
+                # The leader was cancelled, try to lead the next call
+                continue
+
+            self.shared += 1
+            return result
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self.executed += 1
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark as retrieved, there may be nobody waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "in_flight": self.in_flight,
+            "executed": self.executed,
+            "shared": self.shared,
+        }
+
+
+repository_flight: SingleFlight | None = (
+    SingleFlight() if _settings.SINGLE_FLIGHT_ENABLED else None
+)
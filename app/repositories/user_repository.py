@@ -1,10 +1,19 @@
 from fastapi import Depends
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.deps import get_database
+from app.core.deps import DatabaseDep, get_unit_of_work
+from app.core.exceptions import ValidationError
+from app.db.unit_of_work import UnitOfWork
 from app.models.user import User
 from app.repositories.base import BaseRepository
+from app.repositories.filters import FilterField
+from app.repositories.pagination import CountStrategy
+from app.schemas.user import normalize_email
+
+# Minimum length of a search matched anywhere in the email, shorter terms
+# give the trigram index nothing to work with and match the start only
+SUBSTRING_SEARCH_MIN_LENGTH = 3
 
 
 class UserRepository(BaseRepository[User]):
@@ -12,28 +21,96 @@ class UserRepository(BaseRepository[User]):
     User repository with specific business logic (async)
     """
 
+    cached_fields = ("id", "email")
+
+    # is_active through ix_users_is_active_created_at_id, created_at through
+    # it or ix_users_created_at_id
+    filter_fields = {
+        "is_active": FilterField("is_active"),
+        "created_after": FilterField("created_at", "gt"),
+        "created_before": FilterField("created_at", "lt"),
+    }
+    # Sort keys and the filters each combines with: created_at through the
+    # indexes above, updated_at through ix_users_updated_at_id or
+    # ix_users_is_active_updated_at_id, which have no created_at to range on
+    sort_fields = {
+        "created_at": ("is_active", "created_after", "created_before"),
+        "updated_at": ("is_active",),
+    }
+
+    # Expression of the unique index on emails, lookups and ON CONFLICT
+    # clauses must use it for the index to apply
+    email_key = func.lower(User.email)
+
     def __init__(self, db: AsyncSession):
         super().__init__(User, db)
 
+    def _lookup_column(self, field: str) -> ColumnElement:
+        if field == "email":
+            return self.email_key
+        return super()._lookup_column(field)
+
     async def get_by_email(self, email: str) -> User | None:
-        """Get user by email"""
-        result = await self.db.execute(
-            select(self.model).filter(self.model.email == email)
+        """Get user by email, whatever its case"""
+        return await self._get_one_by("email", normalize_email(email))
+
+    async def get_existing_emails(self, emails: list[str]) -> set[str]:
+        """Get which of the given emails are already registered"""
+        if not emails:
+            return set()
+
+        result = await self.db.scalars(
+            select(self.model.email).filter(
+                self.email_key.in_([normalize_email(email) for email in emails])
+            )
         )
 
-        return result.scalar_one_or_none()
+        return set(result.all())
 
     async def get_active_users(self, skip: int = 0, limit: int = 100) -> list[User]:
-        """Get all active users"""
-        result = await self.db.execute(
-            select(self.model).filter(self.model.is_active).offset(skip).limit(limit)
+        """Get all active users, oldest first"""
+        page = await self.get_all(
+            skip,
+            limit,
+            CountStrategy.NONE,
+            criteria=self.filter_criteria({"is_active": True}),
+            order_by=self.sort_order("created_at"),
         )
 
-        return list(result.scalars().all())
+        return page.items
+
+    def email_search(self, term: str) -> ColumnElement[bool]:
+        """Criterion matching emails containing ``term``, whatever its case
+
+        Terms shorter than ``SUBSTRING_SEARCH_MIN_LENGTH`` match the start
+        of the email, through the ``text_pattern_ops`` index; longer ones
+        anywhere, through the trigram index. LIKE wildcards in ``term`` are
+        matched literally.
+
+        Raises:
+            ValidationError: ``term`` is blank, it would match every email
+        """
+        term = normalize_email(term)
+        if not term:
+            raise ValidationError("Search term must not be blank", field="search")
+        if len(term) < SUBSTRING_SEARCH_MIN_LENGTH:
+            return self.email_key.startswith(term, autoescape=True)
+        return self.email_key.contains(term, autoescape=True)
+
+
+_unit_of_work = Depends(get_unit_of_work)
 
 
-_database = Depends(get_database)
+async def get_user_repository(
+    unit_of_work: UnitOfWork = _unit_of_work,
+) -> UserRepository:
+    return UserRepository(unit_of_work.session)
 
 
-async def get_user_repository(db: AsyncSession = _database) -> UserRepository:
+async def get_autocommit_user_repository(
+    db: AsyncSession = DatabaseDep,
+) -> UserRepository:
+    """Repository outside the request's unit of work, each write commits
+    on its own. For long writes such as bulk imports, which would
+    otherwise hold one transaction open for their whole run."""
     return UserRepository(db)
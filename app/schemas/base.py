@@ -48,14 +48,22 @@ class ResponseBase(BaseSchema, Generic[T]):
 
 
 class PaginationMeta(BaseSchema):
-    """Pagination metadata"""
+    """Pagination metadata
 
-    page: int
+    Offset pagination fills ``page``, ``total`` and ``pages``; cursor
+    pagination fills ``next_cursor`` and ``prev_cursor`` instead.
+    ``total_exact`` is false when the total is an estimate or may be stale.
+    """
+
+    page: int | None = None
     per_page: int
-    total: int
-    pages: int
+    total: int | None = None
+    total_exact: bool = True
+    pages: int | None = None
     has_next: bool
     has_prev: bool
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
 
 
 class PaginationResponse(ResponseBase[list[T]]):
@@ -1,13 +1,26 @@
-from pydantic import ConfigDict, EmailStr, Field
+from typing import Literal
+from uuid import UUID
+
+from pydantic import ConfigDict, EmailStr, Field, field_validator
 
 from app.schemas.base import BaseSchema, TimestampMixin, UUIDMixin
 
 
+def normalize_email(email: str) -> str:
+    """Form emails are stored and compared in, they are case-insensitive"""
+    return email.strip().lower()
+
+
 class UserBase(BaseSchema):
     """Base schema for user"""
 
     email: EmailStr = Field("base@example.com", description="User email")
 
+    @field_validator("email")
+    @classmethod
+    def lowercase_email(cls, v: str) -> str:
+        return normalize_email(v)
+
 
 class UserCreate(UserBase):
     """Schema for user creation"""
@@ -18,7 +31,21 @@ class UserCreate(UserBase):
 class UserUpdate(UserCreate):
     """Schema for user update"""
 
-    pass
+    is_active: bool = Field(True, description="User is active")
+
+
+class UserFilter(BaseSchema):
+    """Criteria selecting the users of a bulk operation"""
+
+    ids: list[UUID] | None = Field(None, description="Only these user ids")
+    is_active: bool | None = Field(None, description="Only (in)active users")
+
+
+class UserBulkUpdate(BaseSchema):
+    """Schema for updating every user matching a filter"""
+
+    where: UserFilter
+    is_active: bool = Field(..., description="New active flag")
 
 
 class CreateUser(UserBase):
@@ -39,3 +66,28 @@ class UserSchema(UserBase, UUIDMixin, TimestampMixin):
     """Schema for user"""
 
     is_active: bool = Field(..., description="User is active")
+
+
+class UserBulkItemResult(BaseSchema):
+    """Outcome of a single row of a bulk user creation"""
+
+    index: int = Field(..., description="Position of the row in the request")
+    status: Literal["created", "duplicate", "invalid"]
+    email: str | None = None
+    id: UUID | None = None
+    error: str | None = None
+
+
+class UserBulkCreateResult(BaseSchema):
+    """Summary of a bulk user creation"""
+
+    created: int = 0
+    duplicates: int = 0
+    invalid: int = 0
+    truncated: bool = Field(
+        False, description="The import stopped before the end of the body"
+    )
+    next_index: int | None = Field(
+        None, description="First row not processed when truncated, resend from it"
+    )
+    results: list[UserBulkItemResult] = Field(default_factory=list)
@@ -1,10 +1,35 @@
+import uuid
+from collections.abc import AsyncIterable, AsyncIterator, Mapping
+from datetime import datetime
+from typing import Any
+
 from fastapi import Depends
+from pydantic import ValidationError as PydanticValidationError
 
-from app.core.exceptions import AuthenticationError
+from app.core.config import get_setting
+from app.core.exceptions import (
+    AuthenticationError,
+    DuplicateEntityError,
+    ServiceUnavailableError,
+    ValidationError,
+)
 from app.core.security import security_manager
 from app.models.user import User
-from app.repositories.user_repository import UserRepository, get_user_repository
-from app.schemas.user import CreateUser
+from app.repositories.pagination import CountStrategy, CursorPage, OffsetPage
+from app.repositories.user_repository import (
+    UserRepository,
+    get_autocommit_user_repository,
+    get_user_repository,
+)
+from app.schemas.user import (
+    CreateUser,
+    UserBulkCreateResult,
+    UserBulkItemResult,
+    UserCreate,
+    UserFilter,
+)
+
+_settings = get_setting()
 
 
 class UserService:
@@ -17,25 +42,183 @@ class UserService:
 
     async def create_user(self, email: str, password: str) -> User:
         """Create a new user with validation"""
-        # Check if user already exists
-        existing_user = await self.user_repository.get_by_email(email)
-        if existing_user:
-            raise ValueError("Email already registered")
-
         # Hash password (simplified for example)
-        hashed_password = security_manager.hash_password(password)
+        hashed_password = await security_manager.hash_password_async(password)
 
         user_data = CreateUser(email=email, hashed_password=hashed_password)
 
-        return await self.user_repository.create(user_data)
+        # Duplicate check and insert are one statement, so concurrent
+        # signups for the same email cannot both get through
+        user = await self.user_repository.create_if_absent(
+            user_data, conflict_fields=[self.user_repository.email_key]
+        )
+        if user is None:
+            raise DuplicateEntityError("User", "email", email)
+
+        return user
+
+    async def create_users_bulk(self, rows: AsyncIterable[Any]) -> UserBulkCreateResult:
+        """Create many users, reporting the outcome of every row
+
+        Rows are consumed as they arrive and written in chunks, so memory
+        stays bounded by the chunk size rather than the request size.
+
+        Nothing raises once a chunk has been written. Past
+        ``BULK_CREATE_MAX_ROWS`` rows, or when password hashing is
+        overloaded, the import stops and the result is marked ``truncated``
+        with ``next_index``, the first row to send again.
+        """
+        summary = UserBulkCreateResult()
+        seen: set[str] = set()
+        chunk: list[tuple[int, UserCreate]] = []
+        index = -1
+
+        async for raw in rows:
+            index += 1
+            if index >= _settings.BULK_CREATE_MAX_ROWS:
+                summary.truncated = True
+                summary.next_index = index
+                break
+
+            try:
+                user = UserCreate.model_validate(raw)
+            except PydanticValidationError as e:
+                summary.results.append(
+                    UserBulkItemResult(
+                        index=index, status="invalid", error=e.errors()[0]["msg"]
+                    )
+                )
+                continue
+
+            if user.email in seen:
+                summary.results.append(
+                    UserBulkItemResult(
+                        index=index, status="duplicate", email=user.email
+                    )
+                )
+                continue
+
+            seen.add(user.email)
+            chunk.append((index, user))
+            if len(chunk) >= _settings.BULK_INSERT_CHUNK_SIZE:
+                written = await self._write_users_chunk(summary, chunk)
+                chunk = []
+                if not written:
+                    break
+
+        if chunk:
+            await self._write_users_chunk(summary, chunk)
+
+        summary.results.sort(key=lambda item: item.index)
+        for item in summary.results:
+            if item.status == "created":
+                summary.created += 1
+            elif item.status == "duplicate":
+                summary.duplicates += 1
+            else:
+                summary.invalid += 1
+
+        return summary
+
+    async def _write_users_chunk(
+        self, summary: UserBulkCreateResult, chunk: list[tuple[int, UserCreate]]
+    ) -> bool:
+        """Write ``chunk`` into ``summary``, ``False`` when the import stops
+
+        An overloaded hashing pool fails the request while nothing has been
+        written yet; afterwards it truncates the import at the chunk.
+        """
+        try:
+            summary.results.extend(await self._create_users_chunk(chunk))
+        except ServiceUnavailableError:
+            if not any(item.status == "created" for item in summary.results):
+                raise
+            summary.truncated = True
+            summary.next_index = chunk[0][0]
+            # Rows after the failed chunk were not written, they are resent
+            summary.results = [
+                item for item in summary.results if item.index < summary.next_index
+            ]
+            return False
+        return True
+
+    async def _create_users_chunk(
+        self, chunk: list[tuple[int, UserCreate]]
+    ) -> list[UserBulkItemResult]:
+        """Insert one chunk of validated, request-unique users"""
+        # Skip bcrypt for emails that are already registered
+        existing = await self.user_repository.get_existing_emails(
+            [user.email for _, user in chunk]
+        )
+        pending = [(index, user) for index, user in chunk if user.email not in existing]
 
-    async def get_user(self, user_id: int) -> User | None:
+        hashed_passwords = await security_manager.hash_passwords_async(
+            [user.password for _, user in pending]
+        )
+        created = await self.user_repository.create_many(
+            [
+                CreateUser(email=user.email, hashed_password=hashed_password)
+                for (_, user), hashed_password in zip(
+                    pending, hashed_passwords, strict=True
+                )
+            ],
+            conflict_fields=[self.user_repository.email_key],
+        )
+        created_ids = {user.email: user.id for user in created}
+
+        return [
+            UserBulkItemResult(
+                index=index,
+                status="created" if user.email in created_ids else "duplicate",
+                email=user.email,
+                id=created_ids.get(user.email),
+            )
+            for index, user in chunk
+        ]
+
+    async def get_user(self, user_id: uuid.UUID) -> User | None:
         """Get user by ID"""
         return await self.user_repository.get_by_id(user_id)
 
-    async def list_users(self, skip: int = 0, limit: int = 100) -> list[User]:
-        """List all users"""
-        return await self.user_repository.get_all(skip, limit)
+    async def users_version(self) -> tuple[datetime | None, int]:
+        """Latest user change and user count, to validate cached lists"""
+        return await self.user_repository.get_version()
+
+    async def list_users(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        count_strategy: CountStrategy = CountStrategy.EXACT,
+        search: str | None = None,
+        filters: Mapping[str, Any] | None = None,
+        sort: str | None = None,
+    ) -> OffsetPage[User]:
+        """List users matching ``search`` and ``filters`` in ``sort`` order"""
+        return await self.user_repository.get_all(
+            skip,
+            limit,
+            count_strategy,
+            criteria=self._list_criteria(search, filters),
+            order_by=self.user_repository.sort_order(sort, filters),
+        )
+
+    async def list_users_by_cursor(
+        self,
+        cursor: str | None = None,
+        limit: int = 100,
+        search: str | None = None,
+        filters: Mapping[str, Any] | None = None,
+    ) -> CursorPage[User]:
+        """List users with keyset pagination"""
+        return await self.user_repository.get_page_by_cursor(
+            cursor, limit, criteria=self._list_criteria(search, filters)
+        )
+
+    def stream_users(self, fetch_size: int | None = None) -> AsyncIterator[User]:
+        """Iterate over every user without loading them all in memory"""
+        return self.user_repository.stream_all(
+            fetch_size or _settings.EXPORT_FETCH_SIZE
+        )
 
     async def authenticate_user(self, email: str, password: str) -> User:
         """Authenticate a user"""
@@ -44,21 +227,60 @@ class UserService:
         if not user:
             raise AuthenticationError()
 
-        valid = security_manager.verify_password(password, user.hashed_password)
+        valid = await security_manager.verify_password_async(
+            password, user.hashed_password
+        )
 
         if not valid:
             raise AuthenticationError()
 
         return user
 
-    async def update_user(self, user_id: int, **kwargs) -> User | None:
+    async def update_user(self, user_id: uuid.UUID, **kwargs) -> User | None:
         """Update user data"""
+        if "password" in kwargs:
+            kwargs["hashed_password"] = await security_manager.hash_password_async(
+                kwargs.pop("password")
+            )
+
         return await self.user_repository.update(user_id, kwargs)
 
-    async def delete_user(self, user_id: int) -> bool:
+    async def delete_user(self, user_id: uuid.UUID) -> bool:
         """Delete a user"""
         return await self.user_repository.delete(user_id)
 
+    async def update_users(self, where: UserFilter, **kwargs) -> list[User]:
+        """Update every user matching ``where``"""
+        return await self.user_repository.update_where(
+            *self._filter_criteria(where), values=kwargs
+        )
+
+    async def delete_users(self, where: UserFilter) -> list[User]:
+        """Delete every user matching ``where``"""
+        return await self.user_repository.delete_where(*self._filter_criteria(where))
+
+    def _list_criteria(
+        self, search: str | None, filters: Mapping[str, Any] | None
+    ) -> list:
+        criteria = self.user_repository.filter_criteria(filters or {})
+        if search is not None:
+            criteria.append(self.user_repository.email_search(search))
+        return criteria
+
+    def _filter_criteria(self, where: UserFilter) -> list:
+        criteria = []
+        if where.ids is not None:
+            criteria.append(User.id.in_(where.ids))
+        if where.is_active is not None:
+            criteria.append(User.is_active.is_(where.is_active))
+
+        if not criteria:
+            raise ValidationError(
+                "At least one filter is required for bulk operations", field="where"
+            )
+
+        return criteria
+
 
 _user_repository = Depends(get_user_repository)
 
@@ -67,3 +289,13 @@ async def get_user_service(
     user_repository: UserRepository = _user_repository,
 ) -> UserService:
     return UserService(user_repository)
+
+
+_autocommit_user_repository = Depends(get_autocommit_user_repository)
+
+
+async def get_bulk_user_service(
+    user_repository: UserRepository = _autocommit_user_repository,
+) -> UserService:
+    """Service committing every chunk of a bulk operation as it is written"""
+    return UserService(user_repository)
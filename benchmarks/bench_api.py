@@ -0,0 +1,129 @@
+"""End-to-end latency of the API, driven in-process through ASGI.
+
+A fixed number of concurrent clients send requests back to back through
+the whole application (middlewares, routing, dependencies, repository and
+a seeded SQLite database), without sockets. Each scenario reports its
+throughput and latency percentiles.
+Run with ``python -m benchmarks.bench_api [scale] [concurrency] [requests]``.
+"""
+
+import asyncio
+import random
+import sys
+import time
+from collections import Counter
+
+from benchmarks.common import (
+    configure_environment,
+    percentiles,
+    print_results,
+    seed_users,
+)
+
+configure_environment()
+
+import httpx  # noqa: E402
+
+from app.db.session import get_engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    method: str,
+    url,
+    concurrency: int,
+    requests: int,
+    headers: dict[str, str] | None = None,
+) -> dict:
+    """Send ``requests`` requests from ``concurrency`` concurrent clients.
+
+    ``url`` is a path, or a callable returning one per request. Responses
+    of 400 and above are counted as errors.
+    """
+    latencies: list[float] = []
+    statuses: Counter[int] = Counter()
+    remaining = requests
+
+    async def client_loop() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            path = url() if callable(url) else url
+            start = time.perf_counter()
+            response = await client.request(method, path, headers=headers)
+            latencies.append(time.perf_counter() - start)
+            statuses[response.status_code] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    return {
+        "requests": requests,
+        "concurrency": concurrency,
+        "requests_per_second": requests / elapsed,
+        **percentiles(latencies),
+        "errors": sum(n for status, n in statuses.items() if status >= 400),
+        "statuses": {str(status): n for status, n in sorted(statuses.items())},
+    }
+
+
+async def run(
+    scale: int = 10_000, concurrency: int = 32, requests: int = 2_000
+) -> dict[str, dict]:
+    ids = await seed_users(scale)
+    pick = random.Random(0)
+    transport = httpx.ASGITransport(app=app)
+
+    async with (
+        app.router.lifespan_context(app),
+        httpx.AsyncClient(transport=transport, base_url="http://bench") as client,
+    ):
+        first_page = await client.get("/v1/users/", params={"limit": 20})
+        user = await client.get(f"/v1/users/{ids[0]}")
+
+        scenarios = (
+            ("GET /health/live", "/health/live", None),
+            ("GET /v1/users/?limit=20", "/v1/users/?limit=20", None),
+            (
+                "GET /v1/users/?limit=20 (If-None-Match)",
+                "/v1/users/?limit=20",
+                {"If-None-Match": first_page.headers["etag"]},
+            ),
+            (
+                "GET /v1/users/?pagination=cursor&limit=20",
+                "/v1/users/?pagination=cursor&limit=20",
+                None,
+            ),
+            (
+                "GET /v1/users/{user_id}",
+                lambda: f"/v1/users/{pick.choice(ids)}",
+                None,
+            ),
+            (
+                "GET /v1/users/{user_id} (If-None-Match)",
+                f"/v1/users/{ids[0]}",
+                {"If-None-Match": user.headers["etag"]},
+            ),
+        )
+
+        results = {}
+        for name, url, headers in scenarios:
+            # Warm up caches and the connection pool before measuring
+            await run_load(client, "GET", url, concurrency, concurrency, headers)
+            results[f"api.{name}"] = await run_load(
+                client, "GET", url, concurrency, requests, headers
+            )
+
+    await get_engine().dispose()
+    return results
+
+
+def main() -> None:
+    args = [int(arg) for arg in sys.argv[1:4]]
+    print_results(asyncio.run(run(*args)))
+
+
+if __name__ == "__main__":
+    main()
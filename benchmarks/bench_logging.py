@@ -0,0 +1,114 @@
+"""Caller-side cost of a log call, old synchronous setup against the queued one.
+
+Run with ``python -m benchmarks.bench_logging``. Each case logs to a file in
+a temporary directory; the time is what the calling code (a request handler)
+pays, the queued sinks finish writing in their own thread afterwards.
+"""
+
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.common import configure_environment
+
+configure_environment()
+
+from loguru import logger  # noqa: E402
+
+from app.core.logging import (  # noqa: E402
+    _TEXT_FORMAT,
+    BackgroundSink,
+    InterceptHandler,
+    LogSampler,
+    _file_writer,
+    _json_format,
+)
+
+
+class FrameWalkingInterceptHandler(logging.Handler):
+    """The previous handler, finding the caller by walking the stack"""
+
+    def emit(self, record):
+        try:
+            level = logger.level(record.levelname).name
+        except ValueError:
+            level = record.levelno
+
+        frame, depth = logging.currentframe(), 2
+        while frame.f_code.co_filename == logging.__file__:
+            frame = frame.f_back
+            depth += 1
+
+        logger.opt(depth=depth, exception=record.exc_info).log(
+            level, record.getMessage()
+        )
+
+
+def _best(func, number: int, repeat: int = 3) -> float:
+    """Fastest of ``repeat`` runs, the box is shared with the writer threads"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for i in range(number):
+            func(i)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def _run(name: str, path: Path, number: int, handler, queued: str, **sink) -> None:
+    logger.remove()
+    if queued == "background":
+        sink_id = logger.add(BackgroundSink(_file_writer(path)), **sink)
+    else:
+        sink_id = logger.add(path, enqueue=queued == "enqueue", **sink)
+    logging.basicConfig(handlers=[handler], level=0, force=True)
+    stdlib = logging.getLogger("sqlalchemy.engine.Engine")
+
+    native = _best(lambda i: logger.info("request {} served", i), number)
+    intercepted = _best(
+        lambda i: stdlib.info("SELECT users.id FROM users WHERE users.id = %s", i),
+        number,
+    )
+
+    start = time.perf_counter()
+    logger.remove(sink_id)
+    drained = time.perf_counter() - start
+    logger.remove()
+
+    print(
+        f"{name:<34} {native / number * 1e6:>8.2f} us/loguru"
+        f" {intercepted / number * 1e6:>8.2f} us/stdlib"
+        f" {drained * 1000:>8.1f} ms drain"
+    )
+
+
+def main(number: int = 10_000) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        directory = Path(directory)
+        sampler = LogSampler({"sqlalchemy.engine": 0.1})
+        cases = (
+            ("sync, frame walking (previous)", FrameWalkingInterceptHandler(), "", {}),
+            ("sync", InterceptHandler(), "", {}),
+            ("loguru enqueue=True", InterceptHandler(), "enqueue", {}),
+            ("background thread", InterceptHandler(), "background", {}),
+            (
+                "background thread, json",
+                InterceptHandler(),
+                "background",
+                {"format": _json_format},
+            ),
+            (
+                "background thread, stdlib 10%",
+                InterceptHandler(),
+                "background",
+                {"filter": sampler},
+            ),
+        )
+        for i, (name, handler, queued, sink) in enumerate(cases):
+            sink.setdefault("format", _TEXT_FORMAT)
+            _run(name, directory / f"{i}.log", number, handler, queued, **sink)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Cost of ``BaseRepository`` operations, one session per operation like a
+request, on a seeded SQLite database standing in for PostgreSQL.
+
+The absolute numbers are SQLite's; what is worth comparing between runs is
+the overhead the repository adds and how it moves.
+Run with ``python -m benchmarks.bench_repository [scale]``.
+"""
+
+import asyncio
+import itertools
+import random
+import sys
+
+from benchmarks.common import (
+    configure_environment,
+    measure_async,
+    print_results,
+    seed_users,
+    synthetic_users,
+)
+
+configure_environment()
+
+from app.db.session import AsyncSessionLocal, get_engine  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.repositories.pagination import CountStrategy  # noqa: E402
+from app.repositories.user_repository import UserRepository  # noqa: E402
+
+
+async def run(scale: int = 10_000, number: int = 200) -> dict[str, dict]:
+    ids = await seed_users(scale)
+    engine = get_engine()
+    pick = random.Random(0)
+    batch_start = itertools.count(scale * 10, 100)
+
+    def operation(body):
+        async def call():
+            async with AsyncSessionLocal(bind=engine) as session:
+                await body(UserRepository(session))
+
+        return call
+
+    async def get_by_id(repository):
+        await repository.get_by_id(pick.choice(ids))
+
+    async def get_by_email(repository):
+        await repository.get_by_email(f"user{pick.randrange(scale)}@example.com")
+
+    async def first_page(repository):
+        await repository.get_all(limit=20, count_strategy=CountStrategy.EXACT)
+
+    async def deep_page(repository):
+        await repository.get_all(
+            skip=max(scale - 40, 0), limit=20, count_strategy=CountStrategy.EXACT
+        )
+
+    async def cursor_page(repository):
+        await repository.get_page_by_cursor(limit=20)
+
+    async def update(repository):
+        await repository.update(pick.choice(ids), {"is_active": pick.random() < 0.5})
+
+    async def create_and_delete(repository):
+        created = await repository.create_many(synthetic_users(100, next(batch_start)))
+        await repository.delete_where(User.id.in_([user.id for user in created]))
+
+    results = {}
+    for name, body, count in (
+        ("get_by_id", get_by_id, number),
+        ("get_by_email", get_by_email, number),
+        ("get_all (first page of 20)", first_page, number),
+        ("get_all (last page of 20)", deep_page, number),
+        ("get_page_by_cursor (20)", cursor_page, number),
+        ("update", update, number),
+        ("create_many + delete_where (100 rows)", create_and_delete, number // 10),
+    ):
+        results[f"repository.{name}"] = await measure_async(operation(body), count)
+
+    await engine.dispose()
+    return results
+
+
+def main() -> None:
+    scale = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    print_results(asyncio.run(run(scale)))
+
+
+if __name__ == "__main__":
+    main()
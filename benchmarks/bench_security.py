@@ -0,0 +1,56 @@
+"""Per-request authentication overhead of SecurityManager.
+
+Run with ``python -m benchmarks.bench_security``.
+"""
+
+import os
+
+from benchmarks.common import configure_environment, measure, print_results
+
+configure_environment()
+
+from jose import jwt  # noqa: E402
+
+from app.core.security import SecurityManager  # noqa: E402
+
+_SUBJECT = "00000000-0000-0000-0000-000000000000"
+
+
+def run(number: int = 20_000, hash_number: int = 5) -> dict[str, dict]:
+    """Time token handling over ``number`` calls and bcrypt over
+    ``hash_number``, bcrypt being thousands of times slower"""
+    manager = SecurityManager()
+    token = manager.create_access_token(_SUBJECT)
+    hashed = manager.hash_password("benchmark-password")
+    secret, algorithm = os.environ["SECRET_KEY"], manager.ALGORITHM
+
+    def uncached_decode():
+        # What every authenticated request paid before: key setup + verify
+        jwt.decode(token, secret, algorithms=[algorithm])
+
+    manager.get_token_data(token)
+    results = {
+        "security.hash_password": measure(
+            lambda: manager.hash_password("benchmark-password"), hash_number, 1
+        ),
+        "security.verify_password": measure(
+            lambda: manager.verify_password("benchmark-password", hashed),
+            hash_number,
+            1,
+        ),
+    }
+    for name, func in (
+        ("encode (precomputed key)", lambda: manager.create_access_token(_SUBJECT)),
+        ("decode (python-jose, per call)", uncached_decode),
+        ("get_token_data (cached)", lambda: manager.get_token_data(token)),
+    ):
+        results[f"security.{name}"] = measure(func, number)
+    return results
+
+
+def main() -> None:
+    print_results(run())
+
+
+if __name__ == "__main__":
+    main()
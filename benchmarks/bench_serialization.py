@@ -0,0 +1,88 @@
+"""Serialization cost of a 100 item ``PaginationResponse[UserInDB]`` page.
+
+Compares FastAPI's ``response_model`` path (dump, validate, serialize,
+``jsonable_encoder``, ``json.dumps``) with ``from_rows`` plus
+``SchemaJSONResponse``, and validation of a single ``UserInDB``.
+Run with ``python -m benchmarks.bench_serialization``.
+"""
+
+import asyncio
+import uuid
+from datetime import UTC, datetime
+
+from benchmarks.common import configure_environment, measure, print_results
+
+configure_environment()
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_model_field  # noqa: E402
+
+from app.api.responses import SchemaJSONResponse, from_rows  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.schemas.base import PaginationMeta, PaginationResponse  # noqa: E402
+from app.schemas.user import UserInDB  # noqa: E402
+
+
+def make_users(count: int = 100) -> list[User]:
+    now = datetime.now(UTC)
+    return [
+        User(
+            id=uuid.uuid4(),
+            email=f"user{i}@example.com",
+            hashed_password="x" * 60,
+            is_active=True,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def run(number: int = 500) -> dict[str, dict]:
+    users = make_users()
+    meta = PaginationMeta(
+        page=1, per_page=100, total=100, pages=1, has_next=False, has_prev=False
+    )
+    field = create_model_field(
+        name="response", type_=PaginationResponse[UserInDB], mode="serialization"
+    )
+    loop = asyncio.new_event_loop()
+
+    def fastapi_path():
+        content = PaginationResponse(data=users, meta=meta)
+        body = loop.run_until_complete(
+            serialize_response(field=field, response_content=content)
+        )
+        JSONResponse(body)
+
+    def fast_path():
+        SchemaJSONResponse(
+            PaginationResponse[UserInDB](data=from_rows(UserInDB, users), meta=meta)
+        )
+
+    def validate():
+        UserInDB.model_validate(users[0])
+
+    assert fastapi_path() is None and fast_path() is None
+    results = {
+        "serialization.page (response_model + jsonable_encoder)": measure(
+            fastapi_path, number
+        ),
+        "serialization.page (SchemaJSONResponse)": measure(fast_path, number),
+        "serialization.UserInDB.model_validate": measure(validate, number * 100),
+    }
+    loop.close()
+    return results
+
+
+def main() -> None:
+    results = run()
+    print_results(results)
+    baseline = results["serialization.page (response_model + jsonable_encoder)"]
+    fast = results["serialization.page (SchemaJSONResponse)"]
+    print(f"{'speedup':<56} {baseline['us_per_op'] / fast['us_per_op']:>12.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,203 @@
+"""Shared setup of the benchmarks: environment, timing, seeding and results.
+
+Call ``configure_environment`` before importing anything from ``app``:
+settings are read once at import time.
+"""
+
+import atexit
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import tempfile
+import time
+import uuid
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+# Metric compared between runs, and whether lower is better
+COMPARED_METRICS = {
+    "us_per_op": True,
+    "p50_ms": True,
+    "p95_ms": True,
+    "p99_ms": True,
+    "requests_per_second": False,
+}
+
+
+def configure_environment() -> None:
+    """Point the app at a throwaway SQLite database, so that no benchmark
+    needs a network or an outside service. Variables already set win."""
+    if "DATABASE_URL" not in os.environ:
+        data_dir = tempfile.mkdtemp(prefix="bench-")
+        atexit.register(shutil.rmtree, data_dir, ignore_errors=True)
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{data_dir}/bench.db"
+
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+    os.environ.setdefault("ENVIRONMENT", "staging")
+    os.environ.setdefault("DB_SCHEMA_STARTUP", "create_all")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+
+def measure(func: Callable[[], object], number: int, repeat: int = 3) -> dict:
+    """Time ``number`` calls of ``func``, keeping the fastest of ``repeat``
+    runs as the figure least disturbed by the rest of the machine"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append(time.perf_counter() - start)
+    return _timing_result(timings, number)
+
+
+async def measure_async(
+    func: Callable[[], Awaitable[object]], number: int, repeat: int = 3
+) -> dict:
+    """``measure`` for coroutine functions, awaited one after the other"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            await func()
+        timings.append(time.perf_counter() - start)
+    return _timing_result(timings, number)
+
+
+def _timing_result(timings: list[float], number: int) -> dict:
+    return {
+        "us_per_op": min(timings) / number * 1e6,
+        "mean_us_per_op": statistics.fmean(timings) / number * 1e6,
+        "number": number,
+        "repeat": len(timings),
+    }
+
+
+def percentiles(latencies: list[float]) -> dict:
+    """p50/p95/p99 of latencies given in seconds, in milliseconds"""
+    if len(latencies) < 2:
+        value = latencies[0] * 1000 if latencies else 0.0
+        return {"p50_ms": value, "p95_ms": value, "p99_ms": value}
+
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "p50_ms": cuts[49] * 1000,
+        "p95_ms": cuts[94] * 1000,
+        "p99_ms": cuts[98] * 1000,
+    }
+
+
+def synthetic_users(count: int, start: int = 0, hashed_password: str = "") -> list:
+    """Rows for ``UserRepository.create_many``, half of them active and
+    created over a spread of dates so range filters have work to do"""
+    epoch = datetime(2024, 1, 1, tzinfo=UTC)
+    return [
+        {
+            "id": uuid.uuid4(),
+            "email": f"user{i}@example.com",
+            "hashed_password": hashed_password,
+            "is_active": i % 2 == 0,
+            "created_at": epoch + timedelta(minutes=i),
+            "updated_at": epoch + timedelta(minutes=i),
+        }
+        for i in range(start, start + count)
+    ]
+
+
+async def seed_users(scale: int) -> list[uuid.UUID]:
+    """Create the schema and top the users table up to ``scale`` rows.
+
+    Returns the ids of the seeded users. Rows share one password hash,
+    bcrypt would otherwise dominate the seeding time.
+    """
+    from sqlalchemy import func, select
+
+    from app.core.config import get_setting
+    from app.core.security import security_manager
+    from app.db.base import Base
+    from app.db.session import AsyncSessionLocal, get_engine
+    from app.models.user import User
+    from app.repositories.user_repository import UserRepository
+
+    engine = get_engine()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    chunk_size = get_setting().BULK_INSERT_CHUNK_SIZE
+    hashed_password = security_manager.hash_password("benchmark-password")
+    async with AsyncSessionLocal(bind=engine) as session:
+        existing = await session.scalar(select(func.count()).select_from(User))
+        repository = UserRepository(session)
+        for start in range(existing, scale, chunk_size):
+            rows = synthetic_users(
+                min(chunk_size, scale - start), start, hashed_password
+            )
+            await repository.create_many(rows)
+
+        return list((await session.scalars(select(User.id).limit(scale))).all())
+
+
+def environment() -> dict:
+    """What a result depends on besides the code, stored with the results"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "timestamp": datetime.now(UTC).isoformat(timespec="seconds"),
+        "commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def write_results(path: Path, results: dict, **options) -> None:
+    payload = {"environment": environment(), "options": options, "results": results}
+    path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n")
+
+
+def print_results(results: dict) -> None:
+    for name, result in results.items():
+        if "us_per_op" in result:
+            print(f"{name:<56} {result['us_per_op']:>12.2f} us/op")
+        else:
+            print(
+                f"{name:<56} {result['requests_per_second']:>9.0f} req/s"
+                f"  p50 {result['p50_ms']:>7.2f}  p95 {result['p95_ms']:>7.2f}"
+                f"  p99 {result['p99_ms']:>7.2f} ms"
+            )
+
+
+def compare_results(baseline: Path, results: dict, threshold: float = 0.1) -> int:
+    """Print the change of every metric against a previous results file.
+
+    Returns the number of metrics that got worse by more than ``threshold``.
+    """
+    previous = json.loads(baseline.read_text())["results"]
+    regressions = 0
+    for name, result in results.items():
+        before = previous.get(name)
+        if before is None:
+            continue
+        for metric, lower_is_better in COMPARED_METRICS.items():
+            if metric not in result or not before.get(metric):
+                continue
+            change = (result[metric] - before[metric]) / before[metric]
+            worse = change > threshold if lower_is_better else change < -threshold
+            regressions += worse
+            print(
+                f"{name:<56} {metric:<20} {before[metric]:>10.2f} ->"
+                f" {result[metric]:>10.2f} {change:>+8.1%}"
+                f"{'  REGRESSION' if worse else ''}"
+            )
+    return regressions
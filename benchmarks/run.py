@@ -0,0 +1,100 @@
+"""Run the benchmark suites and write their results as JSON.
+
+Run with ``python -m benchmarks.run``; ``--compare`` prints the change
+against a previous results file and exits non-zero on regressions.
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+from benchmarks.common import (
+    compare_results,
+    configure_environment,
+    print_results,
+    write_results,
+)
+
+configure_environment()
+
+SUITES = ("security", "serialization", "repository", "api")
+
+
+async def _run_async(args: argparse.Namespace) -> dict[str, dict]:
+    results = {}
+    if "repository" in args.suites:
+        from benchmarks import bench_repository
+
+        results.update(await bench_repository.run(args.scale))
+    if "api" in args.suites:
+        from benchmarks import bench_api
+
+        results.update(await bench_api.run(args.scale, args.concurrency, args.requests))
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--suites",
+        type=lambda value: value.split(","),
+        default=list(SUITES),
+        help=f"comma separated subset of {','.join(SUITES)}",
+    )
+    parser.add_argument(
+        "--scale", type=int, default=10_000, help="users seeded in the database"
+    )
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument(
+        "--requests", type=int, default=2_000, help="requests per API scenario"
+    )
+    parser.add_argument("--output", type=Path, default=Path("bench-results.json"))
+    parser.add_argument("--compare", type=Path, help="previous results file")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative change counted as a regression",
+    )
+    args = parser.parse_args()
+
+    unknown = set(args.suites) - set(SUITES)
+    if unknown:
+        parser.error(f"unknown suites: {', '.join(sorted(unknown))}")
+
+    results = {}
+    if "security" in args.suites:
+        from benchmarks import bench_security
+
+        results.update(bench_security.run())
+    if "serialization" in args.suites:
+        from benchmarks import bench_serialization
+
+        results.update(bench_serialization.run())
+    results.update(asyncio.run(_run_async(args)))
+
+    print_results(results)
+    write_results(
+        args.output,
+        results,
+        suites=args.suites,
+        scale=args.scale,
+        concurrency=args.concurrency,
+        requests=args.requests,
+    )
+    print(f"\nResults written to {args.output}")
+
+    if args.compare is not None:
+        print(f"\nCompared with {args.compare}")
+        regressions = compare_results(args.compare, results, args.threshold)
+        if regressions:
+            print(
+                f"{regressions} metric(s) regressed by more than {args.threshold:.0%}"
+            )
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+import os
+
+# Settings are read once at import time, so the test environment has to be
+# in place before anything imports ``app``
+os.environ["DATABASE_URL"] = "sqlite+aiosqlite://"
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ.setdefault("ENVIRONMENT", "development")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from datetime import UTC, datetime, timedelta  # noqa: E402
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+from sqlalchemy.ext.asyncio import (  # noqa: E402
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from app.core.deps import get_database  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import RoutingSession  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.repositories.base import BaseRepository  # noqa: E402
+
+EPOCH = datetime(2024, 1, 1, tzinfo=UTC)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def session_factory():
+    """Sessions on a fresh in-memory database with the users table"""
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    yield async_sessionmaker(
+        bind=engine,
+        class_=AsyncSession,
+        sync_session_class=RoutingSession,
+        expire_on_commit=False,
+    )
+    await engine.dispose()
+
+
+@pytest.fixture
+async def users(session_factory) -> list[User]:
+    """Ten users ``user0`` to ``user9``, created a minute apart, even ones
+    active"""
+    rows = [
+        User(
+            email=f"user{i}@example.com",
+            hashed_password="hashed",
+            is_active=i % 2 == 0,
+            created_at=EPOCH + timedelta(minutes=i),
+            updated_at=EPOCH + timedelta(minutes=i),
+        )
+        for i in range(10)
+    ]
+    async with session_factory() as session:
+        session.add_all(rows)
+        await session.commit()
+    # Written behind the repositories' back, drop any total they cached
+    BaseRepository.count_cache.invalidate(User.__tablename__)
+    return rows
+
+
+@pytest.fixture
+async def client(session_factory):
+    """Client of the whole application, in-process and without lifespan"""
+
+    async def database():
+        async with session_factory() as session:
+            yield session
+
+    app.dependency_overrides[get_database] = database
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+    app.dependency_overrides.pop(get_database)
@@ -0,0 +1,126 @@
+import asyncio
+
+import pytest
+
+from app.core.exceptions import ServiceUnavailableError
+from app.middleware.admission import ConcurrencyLimiter
+
+pytestmark = pytest.mark.anyio
+
+
+def _limiter(limit=1, max_queue=2, timeout=1.0) -> ConcurrencyLimiter:
+    return ConcurrencyLimiter("test", limit, max_queue, timeout)
+
+
+async def _settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+async def test_slots_are_taken_without_waiting_up_to_the_limit():
+    limiter = _limiter(limit=2)
+
+    await limiter.acquire()
+    await limiter.acquire()
+
+    assert (limiter.active, limiter.waiting) == (2, 0)
+
+
+async def test_freed_slots_go_to_waiters_in_arrival_order():
+    limiter = _limiter(limit=1, max_queue=3)
+    await limiter.acquire()
+    admitted = []
+
+    async def request(name):
+        await limiter.acquire()
+        admitted.append(name)
+
+    tasks = [asyncio.create_task(request(name)) for name in "abc"]
+    await _settle()
+    assert limiter.waiting == 3
+
+    for _ in range(3):
+        limiter.release()
+        await _settle()
+
+    await asyncio.gather(*tasks)
+    assert admitted == ["a", "b", "c"]
+    assert (limiter.active, limiter.waiting) == (1, 0)
+
+
+async def test_newcomer_cannot_jump_the_queue():
+    limiter = _limiter(limit=1)
+    await limiter.acquire()
+    queued = asyncio.create_task(limiter.acquire())
+    await _settle()
+
+    limiter.release()
+    newcomer = asyncio.create_task(limiter.acquire())
+    await _settle()
+
+    assert queued.done()
+    assert not newcomer.done()
+    newcomer.cancel()
+
+
+async def test_full_queue_is_shed():
+    limiter = _limiter(limit=1, max_queue=1)
+    await limiter.acquire()
+    queued = asyncio.create_task(limiter.acquire())
+    await _settle()
+
+    with pytest.raises(ServiceUnavailableError):
+        await limiter.acquire()
+    queued.cancel()
+
+
+async def test_wait_past_the_timeout_is_shed():
+    limiter = _limiter(limit=1, timeout=0.01)
+    await limiter.acquire()
+
+    with pytest.raises(ServiceUnavailableError) as exc_info:
+        await limiter.acquire()
+
+    assert exc_info.value.status_code == 503
+    assert (limiter.active, limiter.waiting) == (1, 0)
+
+
+@pytest.mark.parametrize(
+    ("interruption", "raised"),
+    [
+        (TimeoutError, ServiceUnavailableError),
+        (asyncio.CancelledError, asyncio.CancelledError),
+    ],
+)
+async def test_slot_handed_over_as_the_wait_ends_is_passed_on(
+    monkeypatch, interruption, raised
+):
+    limiter = _limiter(limit=1)
+    await limiter.acquire()
+
+    async def wait_for(waiter, timeout):
+        # The holder releases right before the deadline or the cancellation
+        # lands, which wait_for built on asyncio.timeout reports on 3.12+
+        limiter.release()
+        assert waiter.done()
+        raise interruption
+
+    monkeypatch.setattr(asyncio, "wait_for", wait_for)
+    with pytest.raises(raised):
+        await limiter.acquire()
+
+    assert (limiter.active, limiter.waiting) == (0, 0)
+
+
+async def test_cancelled_waiter_leaves_the_queue():
+    limiter = _limiter(limit=1)
+    await limiter.acquire()
+    queued = asyncio.create_task(limiter.acquire())
+    await _settle()
+
+    queued.cancel()
+    await _settle()
+
+    assert (limiter.active, limiter.waiting) == (1, 0)
+    limiter.release()
+    assert limiter.active == 0
@@ -0,0 +1,153 @@
+import gzip
+import zlib
+
+import pytest
+
+from app.middleware.compression import CompressionMiddleware, negotiate_encoding
+
+pytestmark = pytest.mark.anyio
+
+BODY = b'{"data": "' + b"compressible " * 200 + b'"}'
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "expected"),
+    [
+        ("gzip, deflate", "gzip"),
+        ("deflate, gzip", "gzip"),
+        ("gzip;q=0.5, deflate", "deflate"),
+        ("GZIP", "gzip"),
+        ("br, *", "gzip"),
+        ("*;q=0, identity", None),
+        ("gzip;q=0", None),
+        ("gzip;q=oops, deflate;q=0.1", "deflate"),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_negotiate_encoding(accept_encoding, expected):
+    assert negotiate_encoding(accept_encoding, ["gzip", "deflate"]) == expected
+
+
+def _app(chunks, content_type="application/json", status=200, headers=()):
+    async def app(scope, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status,
+                "headers": [
+                    (b"content-type", content_type.encode()),
+                    *((name.encode(), value.encode()) for name, value in headers),
+                ],
+            }
+        )
+        for i, chunk in enumerate(chunks):
+            more_body = i < len(chunks) - 1
+            await send(
+                {"type": "http.response.body", "body": chunk, "more_body": more_body}
+            )
+
+    return app
+
+
+async def _call(app, accept_encoding="gzip", **options):
+    middleware = CompressionMiddleware(app, **options)
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/",
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+    }
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append(message)
+
+    await middleware(scope, receive, send)
+    start, *bodies = messages
+    headers = {name.decode(): value.decode() for name, value in start["headers"]}
+    return start, headers, [message["body"] for message in bodies]
+
+
+async def test_large_body_is_compressed():
+    start, headers, bodies = await _call(_app([BODY], headers=[("etag", '"v1"')]))
+
+    assert headers["content-encoding"] == "gzip"
+    assert headers["vary"] == "Accept-Encoding"
+    assert headers["content-length"] == str(len(bodies[0]))
+    # The encoded bytes differ, a strong validator would lie
+    assert headers["etag"] == 'W/"v1"'
+    assert gzip.decompress(b"".join(bodies)) == BODY
+
+
+async def test_deflate_is_zlib_wrapped():
+    _, headers, bodies = await _call(_app([BODY]), accept_encoding="deflate")
+
+    assert headers["content-encoding"] == "deflate"
+    assert zlib.decompress(b"".join(bodies)) == BODY
+
+
+async def test_body_below_the_threshold_is_sent_as_is():
+    _, headers, bodies = await _call(_app([b"{}"]), minimum_size=1024)
+
+    assert "content-encoding" not in headers
+    assert headers["vary"] == "Accept-Encoding"
+    assert b"".join(bodies) == b"{}"
+
+
+async def test_threshold_counts_the_chunks_held_so_far():
+    chunks = [b"x" * 600, b"y" * 600, b"z" * 600]
+    _, headers, bodies = await _call(_app(chunks, "text/plain"), minimum_size=1024)
+
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+    assert gzip.decompress(b"".join(bodies)) == b"".join(chunks)
+
+
+async def test_streamed_body_is_flushed_chunk_by_chunk():
+    chunks = [b'{"row": %d}\n' % i * 100 for i in range(3)]
+    _, headers, bodies = await _call(
+        _app(chunks, "application/x-ndjson"), minimum_size=0
+    )
+
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    assert headers["content-encoding"] == "gzip"
+    # Every chunk is readable by the client as soon as it is sent
+    assert [decompressor.decompress(body) for body in bodies] == chunks
+
+
+@pytest.mark.parametrize(
+    ("accept_encoding", "content_type", "status", "headers"),
+    [
+        ("identity", "application/json", 200, ()),
+        ("gzip", "image/png", 200, ()),
+        ("gzip", "text/event-stream", 200, ()),
+        ("gzip", "application/json", 304, ()),
+        ("gzip", "application/json", 200, [("content-encoding", "br")]),
+    ],
+)
+async def test_response_passes_through(accept_encoding, content_type, status, headers):
+    _, response_headers, bodies = await _call(
+        _app([BODY], content_type, status, headers),
+        accept_encoding=accept_encoding,
+        minimum_size=0,
+    )
+
+    assert response_headers.get("content-encoding") == dict(headers).get(
+        "content-encoding"
+    )
+    assert "vary" not in response_headers
+    assert b"".join(bodies) == BODY
+
+
+async def test_level_is_chosen_per_content_type():
+    _, _, fast = await _call(
+        _app([BODY]), minimum_size=0, levels={"application/json": 1}
+    )
+    _, _, best = await _call(_app([BODY]), minimum_size=0, level=9)
+
+    assert len(best[0]) <= len(fast[0])
+    assert gzip.decompress(fast[0]) == gzip.decompress(best[0]) == BODY
@@ -0,0 +1,68 @@
+import pytest
+from sqlalchemy import event
+
+from app.db.unit_of_work import UnitOfWork
+from app.repositories.cache import MemoryCacheBackend
+from app.repositories.user_repository import UserRepository
+
+pytestmark = pytest.mark.anyio
+
+
+def _repository(session, cache) -> UserRepository:
+    repository = UserRepository(session)
+    repository.cache = cache
+    repository.flight = None
+    return repository
+
+
+async def test_lookup_reads_through_the_cache(session_factory, users):
+    cache = MemoryCacheBackend()
+    async with session_factory() as session:
+        await _repository(session, cache).get_by_id(users[0].id)
+
+    statements = []
+    async with session_factory() as session:
+        event.listen(
+            session.sync_session.get_bind(),
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+        user = await _repository(session, cache).get_by_id(users[0].id)
+
+    assert user.email == "user0@example.com"
+    assert statements == []
+    assert cache.hits == 1
+
+
+async def test_lookup_after_a_flushed_update_sees_the_update(session_factory, users):
+    cache = MemoryCacheBackend()
+    async with session_factory() as session:
+        await _repository(session, cache).get_by_id(users[0].id)
+
+    async with session_factory() as session:
+        unit_of_work = UnitOfWork(session)
+        repository = _repository(session, cache)
+        await repository.update(users[0].id, {"is_active": False})
+
+        user = await repository.get_by_id(users[0].id)
+
+        assert user.is_active is False
+        # Invalidation only happens on commit, the stale entry is skipped
+        assert cache.hits == 0
+        await unit_of_work.close()
+
+
+async def test_lookup_without_cache_or_single_flight_skips_snapshots(
+    session_factory, users, monkeypatch
+):
+    def no_snapshot(self, db_obj):
+        raise AssertionError("snapshot taken without cache or single flight")
+
+    monkeypatch.setattr(UserRepository, "_snapshot", no_snapshot)
+    async with session_factory() as session:
+        repository = _repository(session, None)
+
+        user = await repository.get_by_id(users[0].id)
+
+        assert user in session
+        assert await repository.get_by_email("USER0@example.com") is user
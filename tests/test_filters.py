@@ -0,0 +1,120 @@
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.core.exceptions import ValidationError
+from app.models.user import User
+from app.repositories.filters import FilterField, filter_criteria, sort_order
+from app.repositories.user_repository import UserRepository
+
+FIELDS = UserRepository.filter_fields
+SORTS = UserRepository.sort_fields
+
+
+def _sql(clauses) -> list[str]:
+    return [str(clause.compile(dialect=postgresql.dialect())) for clause in clauses]
+
+
+def test_filters_compare_their_column_with_their_operator():
+    criteria = filter_criteria(
+        User,
+        FIELDS,
+        {"is_active": True, "created_after": "2024-01-01", "created_before": None},
+    )
+
+    assert _sql(criteria) == [
+        "users.is_active = true",
+        "users.created_at > %(created_at_1)s",
+    ]
+
+
+def test_unknown_filter_is_rejected():
+    with pytest.raises(ValidationError) as exc_info:
+        filter_criteria(User, FIELDS, {"hashed_password": "x"})
+
+    assert exc_info.value.detail == {"field": "hashed_password"}
+
+
+def test_unknown_filter_operator_is_refused_at_declaration():
+    with pytest.raises(ValueError, match="like"):
+        FilterField("email", "like")
+
+
+@pytest.mark.parametrize(
+    ("sort", "expected"),
+    [
+        (None, []),
+        ("", []),
+        ("created_at", ["users.created_at ASC", "users.id ASC"]),
+        ("-created_at", ["users.created_at DESC", "users.id DESC"]),
+        ("updated_at", ["users.updated_at ASC", "users.id ASC"]),
+        ("-updated_at", ["users.updated_at DESC", "users.id DESC"]),
+    ],
+)
+def test_sort_breaks_ties_on_id_in_the_key_direction(sort, expected):
+    assert _sql(sort_order(User, SORTS, sort)) == expected
+
+
+@pytest.mark.parametrize(
+    "sort",
+    [
+        "hashed_password",
+        "--created_at",
+        "+created_at",
+        "+-created_at",
+        "-+created_at",
+        " created_at",
+        "created_at,-updated_at",
+        "created_at,created_at",
+        "-",
+    ],
+)
+def test_malformed_or_unknown_sort_is_rejected(sort):
+    with pytest.raises(ValidationError) as exc_info:
+        sort_order(User, SORTS, sort)
+
+    assert exc_info.value.detail == {"field": "sort"}
+
+
+@pytest.mark.parametrize(
+    ("sort", "filters"),
+    [
+        ("created_at", {"is_active": False}),
+        ("-created_at", {"is_active": True, "created_after": "2024-01-01"}),
+        ("created_at", {"created_after": "2024-01-01", "created_before": "2025"}),
+        ("-updated_at", {"is_active": False}),
+        ("updated_at", {"created_after": None}),
+    ],
+)
+def test_sort_accepts_filters_backed_by_an_index(sort, filters):
+    assert sort_order(User, SORTS, sort, filters)
+
+
+@pytest.mark.parametrize(
+    ("sort", "filters", "rejected"),
+    [
+        ("updated_at", {"created_after": "2024-01-01"}, "created_after"),
+        (
+            "-updated_at",
+            {"is_active": True, "created_before": "2024"},
+            "created_before",
+        ),
+    ],
+)
+def test_sort_rejects_filters_without_an_index(sort, filters, rejected):
+    with pytest.raises(ValidationError, match=rejected) as exc_info:
+        sort_order(User, SORTS, sort, filters)
+
+    assert exc_info.value.detail == {"field": "sort"}
+
+
+def test_every_sort_and_filter_pair_has_an_index():
+    indexes = [
+        tuple(column.name for column in index.columns)
+        for index in User.__table__.indexes
+    ]
+    for key, filters in SORTS.items():
+        assert (key, "id") in indexes
+        for name in filters:
+            column = FIELDS[name].column
+            leading = (column, "id") if column == key else (column, key, "id")
+            assert leading in indexes, (key, name)
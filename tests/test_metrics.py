@@ -0,0 +1,68 @@
+import sys
+import threading
+import time
+
+import pytest
+
+from app.core.logging import _TokenBucket
+from app.core.metrics import Counter, Histogram
+
+THREADS = 8
+UPDATES = 20_000
+
+
+@pytest.fixture(autouse=True)
+def frequent_thread_switches():
+    # Make a lost update between the read and the write of a value likely
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def _run_threads(target) -> None:
+    threads = [threading.Thread(target=target) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_counter_keeps_updates_from_every_thread():
+    counter = Counter("dropped_total", "Dropped records", ("logger",))
+
+    def update():
+        for _ in range(UPDATES):
+            counter.inc("app")
+
+    _run_threads(update)
+
+    assert counter.value("app") == THREADS * UPDATES
+
+
+def test_histogram_keeps_observations_from_every_thread():
+    histogram = Histogram("duration_seconds", "Durations", buckets=(0.1, 1.0))
+
+    def update():
+        for _ in range(UPDATES):
+            histogram.observe(0.5)
+
+    _run_threads(update)
+
+    assert histogram.count() == THREADS * UPDATES
+    assert "duration_seconds_sum 80000" in "\n".join(histogram.render())
+
+
+def test_token_bucket_never_hands_out_more_than_its_rate():
+    bucket = _TokenBucket(rate=1_000)
+    taken = []
+
+    def take():
+        taken.append(sum(bucket.take() for _ in range(1_000)))
+
+    start = time.monotonic()
+    _run_threads(take)
+    elapsed = time.monotonic() - start
+
+    # The initial burst plus what refilled while the threads ran
+    assert sum(taken) <= 1_000 + elapsed * 1_000 + 1
@@ -0,0 +1,57 @@
+import base64
+import json
+import uuid
+from datetime import UTC, datetime
+
+import pytest
+
+from app.core.exceptions import ValidationError
+from app.repositories.pagination import decode_cursor, encode_cursor
+
+CREATED_AT = datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=UTC)
+ID = uuid.UUID("12345678-1234-5678-1234-567812345678")
+
+
+def _token(payload) -> str:
+    raw = json.dumps(payload).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+@pytest.mark.parametrize("backward", [False, True])
+def test_cursor_round_trip(backward):
+    cursor = encode_cursor(CREATED_AT, ID, backward=backward)
+
+    assert decode_cursor(cursor) == (CREATED_AT, ID, backward)
+
+
+def test_cursor_is_url_safe():
+    cursor = encode_cursor(CREATED_AT, ID)
+
+    assert "=" not in cursor
+    assert set(cursor) <= set(
+        "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+    )
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "",
+        "not a cursor",
+        "%%%%",
+        base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+        _token("just a string"),
+        _token({"created_at": CREATED_AT.isoformat()}),
+        _token([CREATED_AT.isoformat(), str(ID)]),
+        _token([CREATED_AT.isoformat(), str(ID), "x"]),
+        _token(["yesterday", str(ID), "n"]),
+        _token([CREATED_AT.isoformat(), "not-a-uuid", "n"]),
+        _token([1, str(ID), "n"]),
+        _token(7),
+    ],
+)
+def test_tampered_cursor_is_rejected(cursor):
+    with pytest.raises(ValidationError) as exc_info:
+        decode_cursor(cursor)
+
+    assert exc_info.value.detail == {"field": "cursor"}
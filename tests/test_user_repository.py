@@ -0,0 +1,77 @@
+import pytest
+
+from app.repositories.pagination import CountStrategy
+from app.repositories.user_repository import UserRepository
+
+pytestmark = pytest.mark.anyio
+
+
+async def _page(session_factory, strategy, skip=0, limit=4, filters=None):
+    async with session_factory() as session:
+        repository = UserRepository(session)
+        return await repository.get_all(
+            skip,
+            limit,
+            strategy,
+            criteria=repository.filter_criteria(filters or {}),
+            order_by=repository.sort_order("created_at"),
+        )
+
+
+@pytest.mark.parametrize("strategy", [CountStrategy.EXACT, CountStrategy.WINDOW])
+async def test_exact_strategies_count_the_filtered_rows(
+    session_factory, users, strategy
+):
+    page = await _page(session_factory, strategy)
+    filtered = await _page(session_factory, strategy, filters={"is_active": True})
+
+    assert (page.total, page.total_exact, page.has_next) == (10, True, True)
+    assert (filtered.total, filtered.total_exact) == (5, True)
+    assert [user.email for user in filtered.items] == [
+        f"user{i}@example.com" for i in (0, 2, 4, 6)
+    ]
+
+
+async def test_window_counts_past_the_last_page(session_factory, users):
+    page = await _page(session_factory, CountStrategy.WINDOW, skip=20)
+
+    assert (page.items, page.total, page.has_next) == ([], 10, False)
+
+
+async def test_cached_count_is_reused_until_a_write(session_factory, users):
+    first = await _page(session_factory, CountStrategy.CACHED)
+    second = await _page(session_factory, CountStrategy.CACHED)
+
+    async with session_factory() as session:
+        await UserRepository(session).delete(users[0].id)
+    third = await _page(session_factory, CountStrategy.CACHED)
+
+    assert (first.total, first.total_exact) == (10, True)
+    assert (second.total, second.total_exact) == (10, False)
+    assert (third.total, third.total_exact) == (9, True)
+
+
+async def test_estimated_count_falls_back_without_planner_statistics(
+    session_factory, users
+):
+    page = await _page(session_factory, CountStrategy.ESTIMATED)
+    filtered = await _page(
+        session_factory, CountStrategy.ESTIMATED, filters={"is_active": True}
+    )
+
+    # SQLite has no estimate: the table is counted, a filtered list is not
+    assert (page.total, page.total_exact) == (10, True)
+    assert (filtered.total, filtered.total_exact, filtered.has_next) == (
+        None,
+        False,
+        True,
+    )
+
+
+@pytest.mark.parametrize(("skip", "has_next"), [(0, True), (6, False)])
+async def test_no_count_still_knows_whether_there_is_a_next_page(
+    session_factory, users, skip, has_next
+):
+    page = await _page(session_factory, CountStrategy.NONE, skip=skip)
+
+    assert (page.total, page.total_exact, page.has_next) == (None, False, has_next)
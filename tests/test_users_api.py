@@ -0,0 +1,108 @@
+import pytest
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_list_etag_validates_the_first_revalidation(client, users):
+    response = await client.get("/v1/users/", params={"limit": 3})
+    etag = response.headers["etag"]
+
+    revalidated = await client.get(
+        "/v1/users/", params={"limit": 3}, headers={"If-None-Match": etag}
+    )
+
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == etag
+    assert revalidated.content == b""
+
+
+async def test_list_etag_depends_on_the_query(client, users):
+    first = await client.get("/v1/users/", params={"limit": 3})
+    other = await client.get(
+        "/v1/users/",
+        params={"limit": 3, "skip": 3},
+        headers={"If-None-Match": first.headers["etag"]},
+    )
+
+    assert other.status_code == 200
+    assert other.headers["etag"] != first.headers["etag"]
+
+
+@pytest.mark.parametrize("pagination", ["offset", "cursor"])
+async def test_list_etag_changes_when_a_user_is_deleted(client, users, pagination):
+    params = {"limit": 3, "pagination": pagination}
+    etag = (await client.get("/v1/users/", params=params)).headers["etag"]
+
+    assert (await client.delete(f"/v1/users/{users[9].id}")).status_code == 200
+    response = await client.get(
+        "/v1/users/", params=params, headers={"If-None-Match": etag}
+    )
+
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+
+
+async def test_list_is_validated_by_etag_only(client, users):
+    response = await client.get("/v1/users/", params={"limit": 3})
+
+    assert "last-modified" not in response.headers
+    assert response.headers["cache-control"] == "no-cache"
+
+    # The deleted user is not the latest change, only the ETag notices
+    await client.delete(f"/v1/users/{users[0].id}")
+    response = await client.get(
+        "/v1/users/",
+        params={"limit": 3},
+        headers={"If-Modified-Since": "Fri, 01 Jan 2100 00:00:00 GMT"},
+    )
+
+    assert response.status_code == 200
+    assert len(response.json()["data"]) == 3
+    assert response.json()["meta"]["total"] == 9
+
+
+async def test_user_is_validated_by_etag_and_last_modified(client, users):
+    url = f"/v1/users/{users[0].id}"
+    response = await client.get(url)
+
+    assert response.headers["last-modified"] == "Mon, 01 Jan 2024 00:00:00 GMT"
+    by_etag = await client.get(url, headers={"If-None-Match": response.headers["etag"]})
+    by_date = await client.get(
+        url, headers={"If-Modified-Since": response.headers["last-modified"]}
+    )
+    stale = await client.get(url, headers={"If-None-Match": 'W/"stale"'})
+
+    assert (by_etag.status_code, by_date.status_code) == (304, 304)
+    assert stale.status_code == 200
+
+
+async def test_list_is_filtered_and_sorted(client, users):
+    response = await client.get(
+        "/v1/users/",
+        params={
+            "is_active": "true",
+            "created_after": "2024-01-01T00:02:00Z",
+            "sort": "-created_at",
+        },
+    )
+
+    assert response.status_code == 200
+    assert [user["email"] for user in response.json()["data"]] == [
+        f"user{i}@example.com" for i in (8, 6, 4)
+    ]
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"sort": "--created_at"},
+        {"sort": "created_at,-updated_at"},
+        {"sort": "-updated_at", "created_before": "2024-01-02T00:00:00Z"},
+        {"sort": "-created_at", "pagination": "cursor"},
+    ],
+)
+async def test_list_rejects_sorts_without_an_index(client, users, params):
+    response = await client.get("/v1/users/", params=params)
+
+    assert response.status_code == 422
+    assert response.json()["detail"] == {"field": "sort"}